@@ -0,0 +1,6 @@
+"""
+Model Scout — discover better or cheaper open-source models for Quily.
+
+Run via `python scripts/model-scout.py` or `python -m model_scout` from scripts/.
+Submodules are imported on demand by the CLI; importing the package itself is free.
+"""
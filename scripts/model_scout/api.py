@@ -0,0 +1,110 @@
+"""HTTP helpers (stdlib only — the scout has no external dependencies)."""
+
+import json
+import urllib.error
+import urllib.request
+
+from .instrument import span
+
+BENCHMARK_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+
+def fetch_json(url: str, headers: dict = None, timeout: int = 30) -> dict:
+    """Fetch JSON from a URL."""
+    req = urllib.request.Request(url, headers=headers or {})
+    with span("http.get", url=url) as s:
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                raw = resp.read()
+                s.set(status=resp.status, bytes=len(raw))
+        except urllib.error.HTTPError as e:
+            s.set(status=e.code)
+            raise
+        return json.loads(raw.decode())
+
+
+def fetch_json_conditional(
+    url: str,
+    headers: dict = None,
+    etag: str = None,
+    last_modified: str = None,
+    timeout: int = 30,
+) -> tuple[dict, str, str]:
+    """
+    Conditional GET. Returns (data, etag, last_modified); data is None when the
+    server answers 304 Not Modified for the given validators.
+    """
+    headers = dict(headers or {})
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    req = urllib.request.Request(url, headers=headers)
+    with span("http.get", url=url, conditional=bool(etag or last_modified)) as s:
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                raw = resp.read()
+                s.set(status=resp.status, bytes=len(raw))
+                return (
+                    json.loads(raw.decode()),
+                    resp.headers.get("ETag"),
+                    resp.headers.get("Last-Modified"),
+                )
+        except urllib.error.HTTPError as e:
+            s.set(status=e.code)
+            if e.code == 304:
+                return None, etag, last_modified
+            raise
+
+
+def stream_sse_json(url: str, payload: dict, headers: dict = None, timeout: int = 60):
+    """
+    POST a streaming request and yield each server-sent event's JSON payload.
+    Closing the generator closes the connection, which cancels the request.
+    """
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json", **(headers or {})},
+    )
+    with span("http.stream", url=url, model=payload.get("model")) as s:
+        received = 0
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                s.set(status=resp.status)
+                for raw in resp:
+                    received += len(raw)
+                    line = raw.decode("utf-8", errors="replace").strip()
+                    # Skip blank separators and SSE comments (OpenRouter sends ": OPENROUTER PROCESSING")
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        return
+                    try:
+                        yield json.loads(data)
+                    except ValueError:
+                        continue
+        except urllib.error.HTTPError as e:
+            s.set(status=e.code)
+            raise
+        finally:
+            s.set(bytes=received)
+
+
+def post_json(url: str, payload: dict, headers: dict = None, timeout: int = 60) -> dict:
+    """POST a JSON payload and return the decoded JSON response."""
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json", **(headers or {})},
+    )
+    with span("http.post", url=url, model=payload.get("model")) as s:
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                raw = resp.read()
+                s.set(status=resp.status, bytes=len(raw))
+        except urllib.error.HTTPError as e:
+            s.set(status=e.code)
+            raise
+        return json.loads(raw.decode())
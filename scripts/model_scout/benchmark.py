@@ -0,0 +1,305 @@
+"""Phase 4 (optional): quality benchmark via OpenRouter."""
+
+import os
+import time
+
+from .api import BENCHMARK_URL, stream_sse_json
+from .failover import record_observations
+from .instrument import span
+from .models import extract_model_size
+from .probe import BENCHMARK_MAX_TOKENS, classify_candidates
+from .prompts import BENCHMARK_PROMPTS, BENCHMARK_SYSTEM_PROMPT
+from .scoring import ABORT_CHECK_CHARS, early_abort_reason, score_response
+from .stats import interval, look_alpha, summarize_samples
+from .usage import BudgetExceeded, UsageLedger, estimate_tokens, extract_usage
+
+
+def build_messages(test: dict) -> list[dict]:
+    """Build the chat messages for a benchmark prompt (supports multi-turn setup)."""
+    messages = [{"role": "system", "content": BENCHMARK_SYSTEM_PROMPT}]
+    if test.get("setup_messages"):
+        messages.extend(test["setup_messages"])
+    messages.append({"role": "user", "content": test["prompt"]})
+    return messages
+
+
+def stream_completion(
+    model_id: str,
+    api_key: str,
+    messages: list[dict],
+    max_tokens: int = 1500,
+    should_abort=None,
+    timeout: int = 60,
+    url: str = None,
+) -> dict:
+    """
+    Stream a chat completion from OpenRouter (or another OpenAI-compatible `url`).
+
+    `should_abort(content)` is called as the answer grows; if it returns a
+    reason the connection is closed, which cancels generation upstream.
+    Usage is estimated from the partial text when the stream is cut short.
+    """
+    payload = {
+        "model": model_id,
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+    start = time.perf_counter()
+    first_token_at = None
+    content = ""
+    checked_len = 0
+    usage = None
+    aborted = None
+
+    stream = stream_sse_json(
+        url or BENCHMARK_URL, payload,
+        headers={"Authorization": f"Bearer {api_key}"},
+        timeout=timeout,
+    )
+    try:
+        for chunk in stream:
+            if chunk.get("usage"):
+                usage = extract_usage(chunk)
+            for choice in chunk.get("choices") or []:
+                delta = (choice.get("delta") or {}).get("content") or ""
+                if delta and first_token_at is None:
+                    first_token_at = time.perf_counter()
+                content += delta
+            # Re-check every few dozen characters rather than on every token
+            if should_abort and len(content) - checked_len >= ABORT_CHECK_CHARS:
+                checked_len = len(content)
+                aborted = should_abort(content)
+                if aborted:
+                    break
+    finally:
+        stream.close()
+
+    estimated = usage is None
+    if estimated:
+        usage = {
+            "prompt_tokens": estimate_tokens(messages),
+            "completion_tokens": len(content) // 4,
+            "reasoning_tokens": 0,
+            "cached_tokens": 0,
+        }
+    return {
+        "content": content,
+        "usage": usage,
+        "usage_estimated": estimated,
+        "aborted": aborted,
+        "ttft_s": (first_token_at - start) if first_token_at else None,
+        "latency_s": time.perf_counter() - start,
+    }
+
+
+def benchmark_model(
+    model_id: str,
+    api_key: str,
+    ledger: UsageLedger = None,
+    max_tokens: int = 1500,
+    prompts: list[dict] = BENCHMARK_PROMPTS,
+    url: str = None,
+) -> dict:
+    """Run one pass of the quality benchmark against a model via OpenRouter (or `url`)."""
+    total_score = 0
+    max_score = 0
+    errors = 0
+    details = []
+
+    for test in prompts:
+        max_score += 3
+        messages = build_messages(test)
+        if ledger:
+            ledger.check(model_id, messages, max_tokens)
+        try:
+            with span("benchmark.prompt", model=model_id, test=test["id"]) as s:
+                completion = stream_completion(
+                    model_id, api_key, messages,
+                    max_tokens=max_tokens,
+                    should_abort=lambda content, test=test: early_abort_reason(test, content),
+                    url=url,
+                )
+                usage = completion["usage"]
+                if ledger:
+                    ledger.record(model_id, test["id"], usage)
+                detail = score_response(test, completion["content"])
+                if completion["aborted"]:
+                    detail["notes"] = "; ".join(
+                        n for n in (detail["notes"], f"aborted: {completion['aborted']}") if n
+                    )
+                detail["response"] = completion["content"]
+                detail["aborted"] = completion["aborted"]
+                detail["usage"] = usage
+                detail["usage_estimated"] = completion["usage_estimated"]
+                detail["ttft_s"] = completion["ttft_s"]
+                detail["latency_s"] = completion["latency_s"]
+                s.set(
+                    score=detail["score"],
+                    aborted=completion["aborted"],
+                    ttft_s=completion["ttft_s"],
+                    prompt_tokens=usage["prompt_tokens"],
+                    completion_tokens=usage["completion_tokens"],
+                )
+            total_score += detail["score"]
+            details.append(detail)
+
+        except Exception as e:
+            # Kept in details for the report and failover profiles, but not a score
+            details.append({
+                "test": test["id"],
+                "score": 0,
+                "error": str(e)[:100],
+            })
+            errors += 1
+
+        # Small delay to avoid rate limiting
+        time.sleep(0.5)
+
+    return {
+        "score": total_score,
+        "max": max_score,
+        "errors": errors,
+        "details": details,
+    }
+
+
+def run_benchmarks(
+    candidates: list[dict],
+    max_models: int = 5,
+    samples: int = 1,
+    min_rounds: int = 2,
+    ledger: UsageLedger = None,
+    prompts: list[dict] = None,
+) -> dict:
+    """
+    Benchmark top N candidates with sequential early stopping.
+
+    The call budget is `samples` passes per model. Each round runs one pass for
+    every model still in contention; from `min_rounds` on, models whose upper
+    bound falls below the leader's lower bound are dropped (at a level that
+    tightens with every look, see stats.look_alpha), and the passes
+    they would have used go to extra rounds for the remaining contenders.
+    Token usage is recorded in `ledger`; the run stops early if its budget
+    would be exceeded. `prompts` defaults to the built-in BENCHMARK_PROMPTS.
+    """
+    prompts = prompts or BENCHMARK_PROMPTS
+    api_key = os.environ.get("OPENROUTER_API_KEY", "")
+    if not api_key:
+        print("\n  WARNING: OPENROUTER_API_KEY not set. Skipping benchmark.")
+        print("  Set it to enable quality testing: export OPENROUTER_API_KEY=sk-or-...")
+        return {}
+
+    # Rank by capability (largest models first), then classify reasoning
+    # behaviour from a measured probe until we have max_models chat models
+    ranked = sorted(candidates, key=lambda c: (
+        -extract_model_size(c["name"]),
+        -c.get("chutes_invocations", 0),
+        -c.get("context_length", 0),
+    ))
+    if ledger:
+        for c in ranked:
+            ledger.set_pricing(c)
+
+    print("  Probing reasoning behaviour (cached per model version)...")
+    probes = classify_candidates(ranked, api_key, ledger, limit=max_models)
+    classes = {mid: p["classification"] for mid, p in probes.items()}
+    to_test = [c for c in ranked if classes.get(c["id"]) in ("chat", "hybrid")]
+    skipped = [c for c in ranked if classes.get(c["id"]) == "reasoning"]  # Too slow for chatbot use
+    if skipped:
+        print(f"  Skipping {len(skipped)} reasoning model(s) (too slow for chatbot):")
+        for s in skipped:
+            print(f"    - {s.get('name', s['id'])}")
+
+    samples = max(1, samples)
+    budget = samples * len(to_test)  # Total benchmark passes we're willing to run
+    print(f"\n  Benchmarking {len(to_test)} candidates "
+          f"({samples} sample{'s' if samples != 1 else ''} each, {budget} passes max)...")
+
+    per_test = {c["id"]: {t["id"]: [] for t in prompts} for c in to_test}
+    pricing = {c["id"]: (c.get("price_in", 0.0), c.get("price_out", 0.0)) for c in to_test}
+    last_pass = {}
+    errors = {c["id"]: 0 for c in to_test}
+    max_score = 3 * len(prompts)
+    dropped_at = {}
+    active = [c["id"] for c in to_test]
+    summaries = {}
+    round_no = 0
+    look = 0
+
+    while active and budget >= len(active):
+        round_no += 1
+        if samples > 1:
+            print(f"    Round {round_no} ({len(active)} model{'s' if len(active) != 1 else ''}):")
+        for mid in active:
+            print(f"    Testing {mid}...", end=" ", flush=True)
+            try:
+                result = benchmark_model(
+                    mid, api_key, ledger,
+                    max_tokens=BENCHMARK_MAX_TOKENS[classes[mid]],
+                    prompts=prompts,
+                )
+            except BudgetExceeded as e:
+                print(f"stopped\n  Budget reached: {e}")
+                active = []
+                break
+            budget -= 1
+            last_pass[mid] = result
+            record_observations(mid, result["details"], pricing[mid])
+            # A failed call (429, timeout) says nothing about answer quality
+            for d in result["details"]:
+                if "error" not in d:
+                    per_test[mid][d["test"]].append(d["score"])
+            errors[mid] += result["errors"]
+            summaries[mid] = summarize_samples(per_test[mid])
+            s = summaries[mid]
+            n_aborted = sum(1 for d in result["details"] if d.get("aborted"))
+            aborted_str = f", {n_aborted} aborted early" if n_aborted else ""
+            if result["errors"]:
+                aborted_str += f", {result['errors']} failed (not scored)"
+            if s["ci_low"] is None:
+                print(f"{result['score']}/{result['max']}" + (f" ({aborted_str[2:]})" if aborted_str else ""))
+            else:
+                print(f"{result['score']}/{result['max']} "
+                      f"(mean {s['mean']:.1f}, 95% CI {s['ci_low']:.1f}–{s['ci_high']:.1f}{aborted_str})")
+
+        if round_no < min_rounds or len(active) == 1:
+            continue
+
+        # Drop models that are clearly behind the leader, at a stricter level
+        # each look so the repeated checks don't add up to more than 5% error
+        look += 1
+        level = look_alpha(look)
+        leader = max(active, key=lambda m: summaries[m]["mean"])
+        leader_low, _ = interval(summaries[leader], level)
+        if leader_low is None:
+            continue
+        for mid in list(active):
+            _, high = interval(summaries[mid], level)
+            # A prompt with no successful call is missing from the total, not scored low
+            unscored = any(not v for v in per_test[mid].values())
+            if mid != leader and high is not None and high < leader_low and not unscored:
+                active.remove(mid)
+                dropped_at[mid] = round_no
+                print(f"    Dropped {mid} (upper bound {high:.1f} < leader's lower bound {leader_low:.1f}, "
+                      f"{1 - level:.1%} level)")
+        if len(active) == 1:
+            break  # Winner decided — no contenders left to spend the budget on
+
+    results = {}
+    for mid, s in summaries.items():
+        results[mid] = {
+            "score": last_pass[mid]["score"] if s["samples"] == 1 else round(s["mean"], 1),
+            "max": max_score,
+            "ci_low": s["ci_low"],
+            "ci_high": s["ci_high"],
+            "samples": s["samples"],
+            "errors": errors[mid],
+            "dropped_after_round": dropped_at.get(mid),
+            "reasoning": classes[mid],
+            "details": last_pass[mid]["details"],
+        }
+        if ledger and mid in ledger.by_model():
+            results[mid]["usage"] = ledger.by_model()[mid]
+    return results
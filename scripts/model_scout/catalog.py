@@ -0,0 +1,244 @@
+"""
+Provider catalogs with local snapshots.
+
+The Chutes catalog is fetched page by page (concurrently after the first page)
+and synced incrementally: each page is requested with the ETag/Last-Modified
+of its stored copy, so unchanged pages cost a 304 instead of a download when
+the API supports conditional requests. Snapshots younger than CATALOG_MAX_AGE
+are reused without any network call; OFFLINE runs use them regardless of age.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .api import fetch_json, fetch_json_conditional
+from .config import CACHE_DIR
+
+OPENROUTER_MODELS_URL = "https://openrouter.ai/api/v1/models"
+CHUTES_LIST_URL = "https://api.chutes.ai/chutes/"
+
+CHUTES_PAGE_SIZE = 500
+CHUTES_FETCH_WORKERS = 4
+CHUTES_MAX_PAGES = 200  # Safety stop if the API ignores `page`
+
+# Run-wide settings, set from the CLI via configure()
+CATALOG_MAX_AGE = 600.0  # Seconds a snapshot is reused without revalidating
+OFFLINE = False
+
+_session = {}  # Catalogs already loaded in this process
+
+
+class OfflineError(RuntimeError):
+    """Raised when --offline is set but no snapshot exists."""
+
+
+def configure(max_age: float = None, offline: bool = None):
+    global CATALOG_MAX_AGE, OFFLINE
+    if max_age is not None:
+        CATALOG_MAX_AGE = max_age
+    if offline is not None:
+        OFFLINE = offline
+
+
+# ─── Snapshots ──────────────────────────────────────────────────────────────
+
+def load_snapshot(name: str) -> dict:
+    try:
+        with open(CACHE_DIR / f"{name}.json") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_snapshot(name: str, data: dict):
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_DIR / f"{name}.json.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        tmp.replace(CACHE_DIR / f"{name}.json")
+    except OSError:
+        pass  # Snapshots are best-effort
+
+
+def _usable_snapshot(name: str) -> dict:
+    """Return the stored snapshot if it may be used without touching the network."""
+    snap = load_snapshot(name)
+    if OFFLINE:
+        if snap is None:
+            raise OfflineError(f"--offline: no {name} snapshot in {CACHE_DIR}")
+        return snap
+    if snap and time.time() - snap.get("fetched_at", 0) < CATALOG_MAX_AGE:
+        return snap
+    return None
+
+
+# ─── OpenRouter ─────────────────────────────────────────────────────────────
+
+def fetch_openrouter_models() -> list[dict]:
+    """Fetch all models from OpenRouter (no auth required)."""
+    if "openrouter" in _session:
+        return _session["openrouter"]
+    snap = _usable_snapshot("openrouter-models")
+    if snap:
+        models = snap["items"]
+    else:
+        data = fetch_json(OPENROUTER_MODELS_URL)
+        models = data.get("data", [])
+        save_snapshot("openrouter-models", {"fetched_at": time.time(), "items": models})
+    _session["openrouter"] = models
+    return models
+
+
+# ─── Chutes ─────────────────────────────────────────────────────────────────
+
+def _chutes_page_url(page: int, limit: int) -> str:
+    return f"{CHUTES_LIST_URL}?include_public=true&limit={limit}&page={page}"
+
+
+def _fetch_chutes_page(page: int, limit: int, stored: dict) -> dict:
+    """Fetch one page, revalidating against the stored copy if we have one."""
+    stored = stored or {}
+    data, etag, last_modified = fetch_json_conditional(
+        _chutes_page_url(page, limit),
+        headers={"Content-Type": "application/json"},
+        etag=stored.get("etag"),
+        last_modified=stored.get("last_modified"),
+    )
+    if data is None:  # 304 Not Modified
+        return {**stored, "unchanged": True}
+    return {
+        "etag": etag,
+        "last_modified": last_modified,
+        "total": data.get("total"),
+        "items": data.get("items", []),
+        "unchanged": False,
+    }
+
+
+def _item_key(item: dict) -> str:
+    return item.get("chute_id") or item.get("slug")
+
+
+def _item_version(item: dict) -> str:
+    return item.get("updated_at") or json.dumps(item, sort_keys=True)
+
+
+def _stored_pages(old: dict, limit: int) -> dict:
+    """
+    Rebuild the stored pages' item lists from the snapshot's single `items`
+    collection (pages only keep their validators and item ids). A page whose
+    items can't all be found loses its validators, so it is fetched in full.
+    """
+    if old.get("page_size") != limit:
+        return {}
+    old_items = old.get("items", {})
+    pages = {}
+    for p, page in old.get("pages", {}).items():
+        if "ids" not in page:  # Older snapshots stored the items in each page
+            pages[p] = page
+        elif all(k in old_items for k in page["ids"]):
+            pages[p] = {**page, "items": [old_items[k] for k in page["ids"]]}
+    return pages
+
+
+def sync_chutes_catalog(limit: int = CHUTES_PAGE_SIZE) -> dict:
+    """
+    Bring the local Chutes snapshot up to date.
+    Returns the new snapshot plus a `changes` summary relative to the old one.
+    """
+    old = load_snapshot("chutes-catalog") or {}
+    old_pages = _stored_pages(old, limit)
+
+    first = _fetch_chutes_page(0, limit, old_pages.get("0"))
+    pages = {"0": first}
+    total = first.get("total")
+    truncated = False
+
+    if total is not None:
+        n_pages = min(-(-total // limit), CHUTES_MAX_PAGES)
+        truncated = total > CHUTES_MAX_PAGES * limit
+        with ThreadPoolExecutor(max_workers=CHUTES_FETCH_WORKERS) as pool:
+            futures = {
+                p: pool.submit(_fetch_chutes_page, p, limit, old_pages.get(str(p)))
+                for p in range(1, n_pages)
+            }
+            for p, fut in futures.items():
+                pages[str(p)] = fut.result()
+    else:
+        # No total reported — walk pages until a short one
+        p = 0
+        while len(pages[str(p)].get("items", [])) >= limit and p + 1 < CHUTES_MAX_PAGES:
+            p += 1
+            pages[str(p)] = _fetch_chutes_page(p, limit, old_pages.get(str(p)))
+        truncated = len(pages[str(p)].get("items", [])) >= limit
+
+    if truncated:
+        print(f"  WARNING: Chutes catalog cut off at {CHUTES_MAX_PAGES} pages of {limit} "
+              f"({total if total is not None else 'unknown'} chutes reported) — raise CHUTES_MAX_PAGES")
+
+    # Merge; pages can shift while we read them, so dedupe by chute_id
+    items = {}
+    for p in sorted(pages, key=int):
+        for item in pages[p].get("items", []):
+            items[_item_key(item)] = item
+
+    old_items = old.get("items", {})
+    added = [k for k in items if k not in old_items]
+    removed = [k for k in old_items if k not in items]
+    changed = [
+        k for k, v in items.items()
+        if k in old_items and _item_version(v) != _item_version(old_items[k])
+    ]
+
+    snapshot = {
+        "fetched_at": time.time(),
+        "page_size": limit,
+        "total": total,
+        "truncated": truncated,
+        # Each item is stored once; pages keep their validators and item ids
+        "pages": {
+            p: {
+                "etag": page.get("etag"),
+                "last_modified": page.get("last_modified"),
+                "total": page.get("total"),
+                "ids": [_item_key(item) for item in page.get("items", [])],
+            }
+            for p, page in pages.items()
+        },
+        "items": items,
+        "changes": {
+            "added": len(added),
+            "changed": len(changed),
+            "removed": len(removed),
+            "pages": len(pages),
+            "pages_unchanged": sum(1 for page in pages.values() if page.get("unchanged")),
+            "first_sync": not old_items,
+        },
+    }
+    save_snapshot("chutes-catalog", snapshot)
+    return snapshot
+
+
+def fetch_chutes_models() -> list[dict]:
+    """All public chutes from Chutes.ai (no auth required), via the local snapshot."""
+    if "chutes" in _session:
+        return _session["chutes"]
+    snap = _usable_snapshot("chutes-catalog")
+    if snap:
+        age = time.time() - snap.get("fetched_at", 0)
+        print(f"  Using Chutes snapshot ({age / 60:.0f} min old)")
+    else:
+        snap = sync_chutes_catalog()
+        ch = snap["changes"]
+        if ch["first_sync"]:
+            print(f"  Catalog sync: {len(snap['items'])} chutes in {ch['pages']} pages")
+        else:
+            print(
+                f"  Catalog sync: +{ch['added']} new, ~{ch['changed']} changed, "
+                f"-{ch['removed']} removed ({ch['pages_unchanged']}/{ch['pages']} pages unchanged)"
+            )
+    chutes = list(snap["items"].values())
+    _session["chutes"] = chutes
+    return chutes
@@ -0,0 +1,810 @@
+"""
+Command-line entry point.
+
+Only argparse is imported up front: each phase module is imported when the
+run actually reaches it, so --help and argument errors return immediately.
+"""
+
+import argparse
+import sys
+
+from .usage import parse_budget
+
+
+def _name_value(text: str) -> tuple[str, str]:
+    """argparse type for NAME=VALUE pairs."""
+    name, sep, value = text.partition("=")
+    if not sep or not name or not value:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    return name.strip().lower(), value.strip()
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid count {value!r}")
+    if n < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return n
+
+
+def _share(value: str) -> float:
+    """argparse type for a fraction of the trace, 0 <= x < 0.5."""
+    try:
+        x = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid share {value!r} (use e.g. 0.01)")
+    if not 0 <= x < 0.5:
+        raise argparse.ArgumentTypeError("share must be between 0 and 0.5")
+    return x
+
+
+def _context_sizes(value: str) -> list[tuple[str, int]]:
+    """argparse type: "4k,16k,64k" -> [("4k", 4096), ("16k", 16384), ("64k", 65536)]."""
+    sizes = []
+    for part in value.split(","):
+        part = part.strip().lower()
+        number, k = part[:-1] if part.endswith("k") else part, part.endswith("k")
+        if not number.isdigit():
+            raise argparse.ArgumentTypeError(f"invalid context size {part!r} (use e.g. 4k,16k,64k)")
+        sizes.append((part, int(number) * (1024 if k else 1)))
+    return sorted(sizes, key=lambda s: s[1])
+
+
+def _seconds_list(value: str) -> list[float]:
+    """argparse type: "10,20,30" -> [10.0, 20.0, 30.0]."""
+    try:
+        seconds = [float(part) for part in value.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid timeouts {value!r} (use e.g. 10,20,30)")
+    if any(s <= 0 for s in seconds):
+        raise argparse.ArgumentTypeError("timeouts must be positive")
+    return sorted(seconds)
+
+
+# ─── Arguments ──────────────────────────────────────────────────────────────
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Scout for better/cheaper open-source models for Quily"
+    )
+    parser.add_argument(
+        "--type",
+        choices=["llm", "embedding"],
+        default="llm",
+        help="Model type to scout (default: llm)",
+    )
+    parser.add_argument(
+        "--max-input",
+        type=float,
+        default=2.0,
+        help="Max input price in $/M tokens (default: 2.0)",
+    )
+    parser.add_argument(
+        "--max-output",
+        type=float,
+        default=8.0,
+        help="Max output price in $/M tokens (default: 8.0)",
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Run quality benchmark on shortlisted candidates (needs OPENROUTER_API_KEY)",
+    )
+    parser.add_argument(
+        "--benchmark-count",
+        type=int,
+        default=5,
+        help="Max models to benchmark (default: 5)",
+    )
+    parser.add_argument(
+        "--samples",
+        type=_positive_int,
+        default=1,
+        help="Benchmark passes per model; enables confidence intervals and early stopping (default: 1)",
+    )
+    parser.add_argument(
+        "--min-rounds",
+        type=int,
+        default=2,
+        help="Rounds before clearly losing models may be dropped (default: 2)",
+    )
+    parser.add_argument(
+        "--suite",
+        default="builtin",
+        help="Benchmark prompts: builtin, full or focused (scripts/eval YAML suites), "
+        "or a path to a suite YAML (default: builtin)",
+    )
+    parser.add_argument(
+        "--sample",
+        type=_positive_int,
+        default=None,
+        help="Benchmark a stratified sample of N suite tests (by category)",
+    )
+    parser.add_argument(
+        "--sample-seed",
+        type=int,
+        default=0,
+        help="Seed for --sample; the same seed gives the same subset (default: 0)",
+    )
+    parser.add_argument(
+        "--rag",
+        action="store_true",
+        help="Benchmark with production-shaped RAG prompts at growing context sizes "
+        "(quality, prefill latency, advertised context check)",
+    )
+    parser.add_argument(
+        "--rag-sizes",
+        type=_context_sizes,
+        default="4k,16k,64k",
+        help="Context sizes for --rag (default: 4k,16k,64k)",
+    )
+    parser.add_argument(
+        "--rag-snapshot",
+        default=None,
+        help="Frozen retrieval snapshot JSON (default: scripts/.model-scout-cache/rag-snapshot.json, "
+        "built from docs/ on first use)",
+    )
+    parser.add_argument(
+        "--cache-probe",
+        action="store_true",
+        help="Measure provider prompt-prefix caching (cached tokens, cold vs warm TTFT) per candidate",
+    )
+    parser.add_argument(
+        "--cache-warm-calls",
+        type=_positive_int,
+        default=3,
+        help="Warm calls after the cold one in --cache-probe (default: 3)",
+    )
+    parser.add_argument(
+        "--watch-current",
+        action="store_true",
+        help="Benchmark the production models and compare against a stored baseline; "
+        "exits 2 on a latency/score regression, 3 if some models couldn't be checked",
+    )
+    parser.add_argument(
+        "--watch-target",
+        choices=["auto", "chutes", "openrouter"],
+        default="auto",
+        help="Where --watch-current sends calls, and which provider's chain --simulate-failover "
+        "compares; auto = Chutes if CHUTES_API_KEY is set (default: auto)",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help="Baseline file for --watch-current (default: scripts/.model-scout-cache/watch-baseline.json)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Record this run as the new --watch-current baseline",
+    )
+    parser.add_argument(
+        "--alert-file",
+        default=None,
+        help="Write regressions to this JSON file (removed again after a clean run)",
+    )
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.05,
+        help="Significance level for --watch-current regression tests (default: 0.05)",
+    )
+    parser.add_argument(
+        "--latency-tolerance",
+        type=float,
+        default=0.2,
+        help="Median latency increase that counts as a regression, as a fraction (default: 0.2)",
+    )
+    parser.add_argument(
+        "--score-tolerance",
+        type=float,
+        default=1.0,
+        help="Drop in total benchmark score that counts as a regression (default: 1.0)",
+    )
+    parser.add_argument(
+        "--simulate-failover",
+        action="store_true",
+        help="Replay synthetic traffic through primary/fallback orderings using latencies "
+        "and error rates recorded by earlier --benchmark/--watch-current runs",
+    )
+    parser.add_argument(
+        "--failover-models",
+        default=None,
+        help="Comma-separated model IDs to order (default: the production chain plus the "
+        "curated LLMs in chuteDiscovery.ts)",
+    )
+    parser.add_argument(
+        "--failover-chain",
+        default=None,
+        help="Comma-separated chain to compare against, primary first (default: what "
+        "src/lib/rag/service.ts tries, incl. BOT_MODEL/BOT_FALLBACK_MODELS)",
+    )
+    parser.add_argument(
+        "--outage-share",
+        type=_share,
+        default=0.01,
+        help="Share of the trace each model is down for in --simulate-failover (default: 0.01)",
+    )
+    parser.add_argument(
+        "--slowdown-share",
+        type=_share,
+        default=0.01,
+        help="Share of the trace each model runs 3x slower in --simulate-failover (default: 0.01)",
+    )
+    parser.add_argument(
+        "--failover-timeouts",
+        type=_seconds_list,
+        default=[10.0, 20.0, 30.0],
+        help="Per-attempt timeouts to try, in seconds (default: 10,20,30)",
+    )
+    parser.add_argument(
+        "--failover-requests",
+        type=int,
+        default=5000,
+        help="Requests in the synthetic trace (default: 5000)",
+    )
+    parser.add_argument(
+        "--chain-length",
+        type=int,
+        default=3,
+        help="Models per failover chain, primary included (default: 3, as in production)",
+    )
+    parser.add_argument(
+        "--budget",
+        type=parse_budget,
+        default=None,
+        help="Stop benchmarking before exceeding a cap: dollars (2.50) or tokens (300k, 500000tok)",
+    )
+    parser.add_argument(
+        "--judge",
+        action="store_true",
+        help="Also grade benchmark answers with an LLM judge (cached by answer hash)",
+    )
+    parser.add_argument(
+        "--judge-model",
+        default=None,
+        help="Judge model (default: anthropic/claude-sonnet-4.5, as in scripts/eval/judge.ts)",
+    )
+    parser.add_argument(
+        "--judge-url",
+        default=None,
+        help="OpenAI-compatible chat completions URL for the judge, e.g. a local stand-in "
+        "(default: OpenRouter; key from JUDGE_API_KEY or OPENROUTER_API_KEY)",
+    )
+    parser.add_argument(
+        "--judge-workers",
+        type=int,
+        default=8,
+        help="Concurrent judge calls (default: 8)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Report format; json prints the report to stdout and progress to stderr (default: text)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Use stored catalog snapshots only (no discovery network calls)",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Revalidate catalogs even if the stored snapshot is fresh",
+    )
+    parser.add_argument(
+        "--catalog-max-age",
+        type=float,
+        default=600,
+        help="Seconds a catalog snapshot is reused without revalidating (default: 600)",
+    )
+    parser.add_argument(
+        "--matrix",
+        action="store_true",
+        help="Compare the same models across providers as a price/latency matrix",
+    )
+    parser.add_argument(
+        "--providers",
+        default="openrouter,chutes,together,fireworks",
+        help="Comma-separated providers for --matrix (default: openrouter,chutes,together,fireworks)",
+    )
+    parser.add_argument(
+        "--provider-url",
+        type=_name_value,
+        action="append",
+        default=[],
+        metavar="NAME=URL",
+        help="Base URL for a provider; unknown names are local OpenAI-compatible servers "
+        "(e.g. local=http://localhost:8000/v1)",
+    )
+    parser.add_argument(
+        "--catalog-file",
+        type=_name_value,
+        action="append",
+        default=[],
+        metavar="NAME=PATH",
+        help="Read a provider's catalog from a local JSON file instead of its API",
+    )
+    parser.add_argument(
+        "--matrix-latency",
+        action="store_true",
+        help="Also measure time-to-first-token per provider in the matrix (uses each provider's key)",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cprofile", "tracemalloc"],
+        default=None,
+        help="Profile the run with cProfile (CPU) or tracemalloc (memory)",
+    )
+    parser.add_argument(
+        "--profile-out",
+        default=None,
+        help="Profile output path (default: scripts/.model-scout-cache/profile.prof or tracemalloc.txt)",
+    )
+    parser.add_argument(
+        "--trace-out",
+        default=None,
+        help="Write phase/HTTP/prompt timing spans to this file",
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=["json", "otlp"],
+        default="json",
+        help="Span export format: plain json or OpenTelemetry OTLP/JSON (default: json)",
+    )
+    return parser
+
+
+# ─── Main ───────────────────────────────────────────────────────────────────
+
+def main(argv: list[str] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.judge and not args.benchmark:
+        parser.error("--judge grades benchmark answers; add --benchmark")
+
+    from .config import load_dotenv
+    load_dotenv()
+
+    if not (args.profile or args.trace_out):
+        return _main(args)
+
+    from .config import CACHE_DIR
+    from .instrument import TRACER, print_span_summary, profiled
+
+    profile_out = args.profile_out
+    if args.profile and not profile_out:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        name = "profile.prof" if args.profile == "cprofile" else "tracemalloc.txt"
+        profile_out = str(CACHE_DIR / name)
+
+    with profiled(args.profile, profile_out):
+        code = _main(args)
+
+    print_span_summary(file=sys.stderr)
+    if args.trace_out:
+        TRACER.write(args.trace_out, args.trace_format)
+        print(f"  Trace ({args.trace_format}): {args.trace_out}", file=sys.stderr)
+    if args.profile == "cprofile":
+        print(f"  Profile: {profile_out} (top functions in {profile_out}.txt)", file=sys.stderr)
+    elif args.profile:
+        print(f"  Memory profile: {profile_out}", file=sys.stderr)
+    return code
+
+
+def _main(args: argparse.Namespace) -> int:
+    from .catalog import OfflineError, configure
+    from .suites import SuiteError
+
+    configure(max_age=0 if args.refresh else args.catalog_max_age, offline=args.offline)
+    try:
+        return _report(args)
+    except (OfflineError, SuiteError) as e:
+        print(f"  ERROR: {e}", file=sys.stderr)
+        return 1
+
+
+def _report(args: argparse.Namespace) -> int:
+    if args.matrix:
+        return run_matrix(args)
+    if args.watch_current:
+        return run_watch_current(args)
+    if args.simulate_failover:
+        return run_failover_simulation(args)
+    if args.format == "json":
+        import contextlib
+        import json
+        from .report import build_json_report
+
+        # Keep stdout clean for the JSON document
+        with contextlib.redirect_stdout(sys.stderr):
+            result = run(args)
+        if result is not None:
+            print(json.dumps(build_json_report(*result), indent=2))
+        return 0
+
+    result = run(args)
+    if result is not None:
+        from .instrument import span
+        from .report import print_report
+        from .usage import print_usage_report
+
+        on_chutes, not_on_chutes, model_type, benchmark_results, ledger, extra = result
+        with span("phase.report"):
+            print_report(on_chutes, not_on_chutes, model_type, benchmark_results)
+            if extra.get("rag"):
+                from .rag import print_rag_report
+                print_rag_report(extra["rag"])
+            if extra.get("prefix_cache"):
+                from .prefix_cache import print_cache_report
+                print_cache_report(extra["prefix_cache"])
+            if ledger:
+                print_usage_report(ledger)
+    return 0
+
+
+def _load_prompts(args: argparse.Namespace) -> tuple[dict, list[dict]]:
+    """The selected suite and the (optionally sampled) prompts to run from it."""
+    from .suites import load_suite, stratified_sample
+
+    suite = load_suite(args.suite)
+    prompts = suite["tests"]
+    if args.sample:
+        prompts = stratified_sample(prompts, args.sample, seed=args.sample_seed)
+    return suite, prompts
+
+
+def _print_suite(args: argparse.Namespace, suite: dict, prompts: list[dict]):
+    if suite["name"] == "builtin":
+        return
+    sampled = f", stratified sample (seed {args.sample_seed})" if args.sample else ""
+    print(f"  Suite: {suite['name']} — {len(prompts)} of {len(suite['tests'])} scoreable tests"
+          f"{sampled}; {suite['skipped']} multi-turn/citation-only/slash-command tests skipped")
+
+
+def run(args: argparse.Namespace):
+    """
+    Run discovery (and the optional benchmark).
+    Returns (on_chutes, not_on_chutes, model_type, benchmark_results, ledger,
+    extra), where `extra` holds the optional stages' results by report section,
+    or None if there was nothing to report.
+    """
+    from .instrument import span
+
+    prompts = None
+    if (args.benchmark or args.rag or args.cache_probe) and args.type == "llm":
+        # Load before discovery so a bad suite fails fast
+        suite, prompts = _load_prompts(args)
+
+    type_label = "LLM" if args.type == "llm" else "Embedding"
+    print(f"Model Scout — {type_label} Discovery")
+    print(f"  Price ceiling: ${args.max_input:.2f}/M in, ${args.max_output:.2f}/M out")
+    print(f"  Benchmark: {'Yes' if args.benchmark else 'No'}")
+    if prompts is not None:
+        _print_suite(args, suite, prompts)
+    print()
+
+    if args.type == "embedding":
+        from .discovery import discover_chutes_embeddings
+
+        # Embedding models: query Chutes directly (OpenRouter doesn't list them)
+        print("Phase 1: Chutes Direct Discovery (embeddings)")
+        with span("phase.discovery", source="chutes"):
+            on_chutes, not_on_chutes = discover_chutes_embeddings()
+        return on_chutes, not_on_chutes, args.type, {}, None, {}
+
+    from .discovery import crosscheck_chutes, discover_openrouter
+
+    # LLM models: OpenRouter discovery + Chutes cross-check
+    print("Phase 1: OpenRouter Discovery")
+    with span("phase.discovery", source="openrouter"):
+        candidates = discover_openrouter(
+            model_type=args.type,
+            max_input_price=args.max_input,
+            max_output_price=args.max_output,
+        )
+
+    if not candidates:
+        print("  No candidates found. Try increasing --max-input / --max-output.")
+        return None
+
+    # Phase 2: Chutes cross-check
+    print("\nPhase 2: Chutes Cross-Check")
+    with span("phase.crosscheck"):
+        on_chutes, not_on_chutes = crosscheck_chutes(candidates, model_type=args.type)
+
+    # Phase 3 (optional): Benchmark
+    benchmark_results = {}
+    extra = {}
+    ledger = None
+    if (args.benchmark or args.rag or args.cache_probe) and on_chutes:
+        from .benchmark import run_benchmarks
+        from .curated import get_current_models
+        from .usage import BudgetExceeded, UsageLedger
+
+        if args.benchmark:
+            print("\nPhase 3: Quality Benchmark")
+        ledger = UsageLedger(budget=args.budget)
+        current = get_current_models(args.type)
+        current_or_ids = {
+            v["openrouter_id"] for v in current.values() if v.get("openrouter_id")
+        }
+        current_chutes_slugs = set(current.keys())
+        new_on_chutes = [c for c in on_chutes
+        if c["id"] not in current_or_ids
+        and c.get("chutes_slug", "") not in current_chutes_slugs]
+        if new_on_chutes and args.benchmark:
+            with span("phase.benchmark"):
+                benchmark_results = run_benchmarks(
+                    new_on_chutes,
+                    max_models=args.benchmark_count,
+                    samples=args.samples,
+                    min_rounds=args.min_rounds,
+                    ledger=ledger,
+                    prompts=prompts,
+                )
+        elif not new_on_chutes:
+            print("  No new candidates to benchmark.")
+
+        if args.judge and benchmark_results:
+            import os
+            from .judge import DEFAULT_JUDGE_MODEL, judge_results
+
+            judge_model = args.judge_model or DEFAULT_JUDGE_MODEL
+            if not args.judge_url:
+                # Price the judge's calls like the candidates' (OpenRouter rates)
+                from .catalog import fetch_openrouter_models
+                from .providers import parse_or_pricing
+
+                for m in fetch_openrouter_models():
+                    if m.get("id") == judge_model:
+                        p_in, p_out = parse_or_pricing(m)
+                        ledger.set_pricing({"id": judge_model, "price_in": p_in, "price_out": p_out})
+                        break
+            with span("phase.judge"):
+                judge_results(
+                    benchmark_results,
+                    judge_model=judge_model,
+                    api_key=os.environ.get("JUDGE_API_KEY") or os.environ.get("OPENROUTER_API_KEY", ""),
+                    judge_url=args.judge_url,
+                    ledger=ledger,
+                    workers=args.judge_workers,
+                    prompts=prompts,
+                )
+
+        from pathlib import Path
+        from .rag import DEFAULT_SNAPSHOT
+
+        snapshot_path = Path(args.rag_snapshot) if args.rag_snapshot else DEFAULT_SNAPSHOT
+        if args.rag and new_on_chutes:
+            from .rag import run_rag_benchmark
+
+            print("\nPhase 4: RAG Benchmark")
+            with span("phase.rag"):
+                try:
+                    extra["rag"] = run_rag_benchmark(
+                        new_on_chutes,
+                        prompts,
+                        args.rag_sizes,
+                        snapshot_path=snapshot_path,
+                        max_models=args.benchmark_count,
+                        ledger=ledger,
+                    )
+                except BudgetExceeded as e:
+                    print(f"  Budget reached: {e}")
+
+        if args.cache_probe and new_on_chutes:
+            from .prefix_cache import run_cache_probes
+
+            print("\nPhase 5: Prompt-Prefix Cache Probe")
+            with span("phase.prefix_cache"):
+                extra["prefix_cache"] = run_cache_probes(
+                    new_on_chutes,
+                    prompts,
+                    warm_calls=args.cache_warm_calls,
+                    max_models=args.benchmark_count,
+                    snapshot_path=snapshot_path,
+                    ledger=ledger,
+                )
+
+    return on_chutes, not_on_chutes, args.type, benchmark_results, ledger, extra
+
+
+def run_matrix(args: argparse.Namespace) -> int:
+    """Fetch every selected provider concurrently and print the cross-provider matrix."""
+    import contextlib
+    import json
+    from .instrument import span
+    from .models import is_open_source
+    from .providers import (
+        build_identity_index, fetch_all, get_provider, measure_matrix_latency,
+        merge_identity_variants, print_matrix,
+    )
+
+    base_urls = dict(args.provider_url)
+    catalog_files = dict(args.catalog_file)
+    names = [n.strip().lower() for n in args.providers.split(",") if n.strip()]
+    names += [n for n in list(base_urls) + list(catalog_files) if n not in names]
+    try:
+        providers = [get_provider(n, catalog_files, base_urls) for n in names]
+    except KeyError as e:
+        print(f"  ERROR: {e.args[0]}", file=sys.stderr)
+        return 1
+
+    out = sys.stderr if args.format == "json" else sys.stdout
+    with contextlib.redirect_stdout(out):
+        print("Model Scout — Cross-Provider Matrix")
+        for p in providers:
+            if not p.enabled():
+                print(f"  Skipping {p.name}: {p.api_key_env} not set")
+        providers = [p for p in providers if p.enabled()]
+
+        with span("phase.discovery", source="providers"):
+            catalogs = fetch_all(providers)
+        index = merge_identity_variants(build_identity_index(catalogs))
+
+        # Models offered by more than one provider, within the price ceiling somewhere
+        identities = sorted(
+            (
+                i for i, row in index.items()
+                if len(row) > 1
+                and any(is_open_source(e["id"]) or is_open_source(e["name"]) for e in row.values())
+                and any(
+                    e["price_in"] is not None
+                    and e["price_in"] <= args.max_input and e["price_out"] <= args.max_output
+                    for e in row.values()
+                )
+            ),
+            key=lambda i: min(
+                (e["price_in"] for e in index[i].values() if e["price_in"] is not None),
+                default=0,
+            ),
+        )
+
+        if args.matrix_latency and identities:
+            with span("phase.latency"):
+                measure_matrix_latency(providers, index, identities)
+
+    if args.format == "json":
+        print(json.dumps({
+            "providers": {
+                name: entries if isinstance(entries, str) else len(entries)
+                for name, entries in catalogs.items()
+            },
+            "models": {i: index[i] for i in identities},
+        }, indent=2))
+    else:
+        print_matrix(providers, catalogs, index, identities)
+    return 0
+
+
+def run_watch_current(args: argparse.Namespace) -> int:
+    """--watch-current: compare production models against the baseline; exit 2 on regressions."""
+    import contextlib
+    import json
+    from pathlib import Path
+    from .instrument import span
+    from .usage import UsageLedger, print_usage_report
+    from .watch import DEFAULT_BASELINE, EXIT_INCOMPLETE, EXIT_REGRESSION, print_watch_report, run_watch
+
+    out = sys.stderr if args.format == "json" else sys.stdout
+    ledger = UsageLedger(budget=args.budget)
+    with contextlib.redirect_stdout(out):
+        print("Model Scout — Current Model Watch")
+        suite, prompts = _load_prompts(args)
+        _print_suite(args, suite, prompts)
+        with span("phase.watch"):
+            report = run_watch(
+                prompts,
+                suite_name=suite["name"],
+                samples=args.samples,
+                target=args.watch_target,
+                baseline_path=Path(args.baseline) if args.baseline else DEFAULT_BASELINE,
+                update_baseline=args.update_baseline,
+                alpha=args.alpha,
+                latency_tol=args.latency_tolerance,
+                score_tol=args.score_tolerance,
+                ledger=ledger,
+            )
+
+    if args.format == "json":
+        print(json.dumps(report, indent=2))
+    else:
+        print_watch_report(report)
+        print_usage_report(ledger)
+
+    if args.alert_file:
+        alert = Path(args.alert_file)
+        if report["regressions"] or report["unchecked"]:
+            alert.write_text(json.dumps({
+                "source": "model-scout --watch-current",
+                "regressions": report["regressions"],
+                "unchecked": report["unchecked"],
+            }, indent=2))
+            print(f"  Alert written: {alert}", file=sys.stderr)
+        elif alert.exists() and "model-scout --watch-current" in alert.read_text(errors="replace"):
+            alert.unlink()  # Clear our own stale alert after a clean run
+    if report["regressions"]:
+        return EXIT_REGRESSION
+    # A partial run isn't a clean bill of health for the models it never reached
+    return EXIT_INCOMPLETE if report["unchecked"] else 0
+
+
+def run_failover_simulation(args: argparse.Namespace) -> int:
+    """--simulate-failover: rank primary/fallback orderings from recorded latency profiles."""
+    import contextlib
+    import json
+    import os
+    from .failover import (
+        MAX_INCIDENT_SHARE, PROFILE_FILE, load_profiles, print_failover_report,
+        production_chain, simulate_failover, usable_models,
+    )
+    from .instrument import span
+    from .watch import watch_targets
+
+    out = sys.stderr if args.format == "json" else sys.stdout
+    with contextlib.redirect_stdout(out):
+        print("Model Scout — Failover Simulation")
+        profiles = load_profiles()
+        provider = args.watch_target
+        if provider == "auto":
+            provider = "chutes" if os.environ.get("CHUTES_API_KEY") else "openrouter"
+        targets = watch_targets(provider)
+        if args.failover_chain:
+            current = [m.strip() for m in args.failover_chain.split(",") if m.strip()]
+        else:
+            current = production_chain(provider)
+            if provider == "chutes":
+                # service.ts names chutes by slug; profiles use the chat model name
+                from .catalog import fetch_chutes_models
+
+                names = {c.get("slug"): c.get("name") for c in fetch_chutes_models()}
+                current = [names.get(m, m) for m in current]
+        print(f"  Production chain ({provider}): {' → '.join(current) or 'unknown'}")
+        if args.failover_models:
+            wanted = [m.strip() for m in args.failover_models.split(",") if m.strip()]
+        else:
+            # Candidates: the production chain plus the models users can pick
+            wanted = current + [t["model"] for t in targets if t["model"] not in current]
+        models, missing = usable_models(profiles, wanted)
+        for m in missing:
+            print(f"  Skipping {m}: too few recorded calls in {PROFILE_FILE.name}")
+        if len(models) < 2:
+            print("  Need profiles for at least two models. Record some first with --watch-current "
+                  "(production models) or --benchmark (candidates).")
+            return 1
+        unpriced = {m for m in models if profiles[m].get("price_in") is None}
+        if unpriced:
+            from .catalog import fetch_openrouter_models
+            from .providers import parse_or_pricing
+
+            for m in fetch_openrouter_models():
+                if m.get("id") in unpriced:
+                    profiles[m["id"]]["price_in"], profiles[m["id"]]["price_out"] = parse_or_pricing(m)
+        if args.outage_share + args.slowdown_share > MAX_INCIDENT_SHARE:
+            print(f"  WARNING: outage + slowdown share above {MAX_INCIDENT_SHARE:.1%} — "
+                  "p95 will mostly measure the incident windows, not normal traffic")
+        print(f"  Simulating {args.failover_requests:,} requests over {len(models)} models, "
+              f"chains of {min(args.chain_length, len(models))}, "
+              f"timeouts {', '.join(f'{t:g}s' for t in args.failover_timeouts)}")
+        with span("phase.failover"):
+            sim = simulate_failover(
+                profiles,
+                models,
+                chain_length=max(1, args.chain_length),
+                timeouts=args.failover_timeouts,
+                requests=args.failover_requests,
+                outage_share=args.outage_share,
+                slowdown_share=args.slowdown_share,
+                current_chain=current,
+            )
+
+    if args.format == "json":
+        print(json.dumps(sim, indent=2))
+    else:
+        print_failover_report(sim)
+    return 0
@@ -0,0 +1,33 @@
+"""Paths and environment for the model scout."""
+
+import os
+from pathlib import Path
+
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = PACKAGE_DIR.parent
+PROJECT_ROOT = SCRIPTS_DIR.parent
+CHUTE_DISCOVERY_TS = PROJECT_ROOT / "src" / "lib" / "chutes" / "chuteDiscovery.ts"
+RAG_SERVICE_TS = PROJECT_ROOT / "src" / "lib" / "rag" / "service.ts"
+EVAL_DIR = SCRIPTS_DIR / "eval"
+CACHE_DIR = SCRIPTS_DIR / ".model-scout-cache"
+
+
+def load_dotenv():
+    """Load .env file from project root (no external dependency)."""
+    # Project root first, then scripts/
+    for parent in [PROJECT_ROOT, SCRIPTS_DIR]:
+        env_file = parent / ".env"
+        if env_file.exists():
+            with open(env_file) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith("#") or "=" not in line:
+                        continue
+                    key, _, value = line.partition("=")
+                    key = key.strip()
+                    value = value.strip().strip("'\"")
+                    # Only set if not already in environment
+                    if key not in os.environ:
+                        os.environ[key] = value
+            break
@@ -0,0 +1,155 @@
+"""Current models, parsed from the curated lists in chuteDiscovery.ts."""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from .config import CACHE_DIR, CHUTE_DISCOVERY_TS
+from .models import is_reasoning_model
+
+
+# chuteDiscovery.ts only knows Chutes slugs — map them to OpenRouter IDs so the
+# scout can exclude models we already use from the OpenRouter candidate list.
+OPENROUTER_IDS = {
+    "chutes-deepseek-ai-deepseek-v3-2-tee": "deepseek/deepseek-v3.2",
+    "chutes-deepseek-ai-deepseek-v3-1-tee": "deepseek/deepseek-chat",
+    "chutes-deepseek-ai-deepseek-r1-tee": "deepseek/deepseek-r1",
+    "chutes-moonshotai-kimi-k2-5-tee": "moonshotai/kimi-k2.5",
+    "chutes-qwen-qwen2-5-72b-instruct": "qwen/qwen-2.5-72b-instruct",
+    "chutes-qwen-qwen3-32b": "qwen/qwen3-32b",
+    "chutes-chutesai-mistral-small-3-2-24b-instruct-2506": "mistralai/mistral-small-3.2-24b-instruct",
+    "chutes-nousresearch-hermes-4-70b": "nousresearch/hermes-4-70b",
+}
+
+# Bump when parse_curated_models or the reasoning heuristic changes what it derives
+CURATED_PARSER_VERSION = 2
+
+_CURATED_ARRAYS = {
+    "llm": "CURATED_LLM_MODELS",
+    "embedding": "CURATED_EMBEDDING_MODELS",
+}
+_TS_OBJECT_RE = re.compile(r"\{([^{}]*)\}")
+_TS_FIELD_RE = re.compile(
+    r"(\w+)\s*:\s*(?:'((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\"|(true|false)|(-?\d+(?:\.\d+)?))"
+)
+
+
+def parse_curated_models(source: str) -> dict:
+    """
+    Extract the curated model arrays from chuteDiscovery.ts source.
+    Returns {"llm": {slug: info}, "embedding": {slug: info}}, ordered by `order`.
+    """
+    result = {}
+    for model_type, const_name in _CURATED_ARRAYS.items():
+        start = source.find(f"const {const_name}")
+        if start == -1:
+            result[model_type] = {}
+            continue
+        body_start = source.index("[", source.index("=", start))
+        body_end = source.index("];", body_start)
+        body = source[body_start:body_end]
+
+        entries = []
+        for obj in _TS_OBJECT_RE.finditer(body):
+            fields = {}
+            for m in _TS_FIELD_RE.finditer(obj.group(1)):
+                key, sq, dq, boolean, number = m.groups()
+                if boolean is not None:
+                    fields[key] = boolean == "true"
+                elif number is not None:
+                    fields[key] = float(number) if "." in number else int(number)
+                else:
+                    fields[key] = sq if sq is not None else dq
+            if fields.get("slug"):
+                entries.append(fields)
+        entries.sort(key=lambda e: e.get("order", 0))
+
+        models = {}
+        for e in entries:
+            slug = e["slug"]
+            if e.get("isRecommended"):
+                role = "primary"
+            elif model_type == "llm" and is_reasoning_model(slug):
+                role = "reasoning"
+            else:
+                role = "fallback"
+            models[slug] = {
+                "display": e.get("displayName", slug),
+                "openrouter_id": OPENROUTER_IDS.get(slug),
+                "role": role,
+            }
+        result[model_type] = models
+    return result
+
+
+def load_current_models(ts_path: Path = CHUTE_DISCOVERY_TS) -> dict:
+    """
+    Load the curated model lists from chuteDiscovery.ts.
+
+    The parsed result is cached on disk. An unchanged mtime/size skips the read
+    entirely; a touched file is re-hashed and only re-parsed if its content changed.
+    """
+    try:
+        st = ts_path.stat()
+    except OSError:
+        print(f"  WARNING: {ts_path} not found — current models unknown")
+        return {"llm": {}, "embedding": {}}
+
+    cache_file = CACHE_DIR / "curated-models.json"
+    # The cached result also depends on OPENROUTER_IDS and the parser, not just the TS file
+    derive_key = hashlib.sha256(
+        json.dumps([CURATED_PARSER_VERSION, OPENROUTER_IDS], sort_keys=True).encode()
+    ).hexdigest()[:16]
+    cached = None
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    if cached and cached.get("derive_key") != derive_key:
+        cached = None
+    if (
+        cached
+        and cached.get("path") == str(ts_path)
+        and cached.get("mtime_ns") == st.st_mtime_ns
+        and cached.get("size") == st.st_size
+    ):
+        return cached["models"]
+
+    raw = ts_path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    if cached and cached.get("path") == str(ts_path) and cached.get("sha256") == digest:
+        models = cached["models"]
+    else:
+        models = parse_curated_models(raw.decode("utf-8"))
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, "w") as f:
+            json.dump({
+                "path": str(ts_path),
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "sha256": digest,
+                "derive_key": derive_key,
+                "models": models,
+            }, f, indent=2)
+    except OSError:
+        pass  # Cache is best-effort
+    return models
+
+
+_current_models = None
+
+
+def get_current_models(model_type: str) -> dict:
+    global _current_models
+    if _current_models is None:
+        _current_models = load_current_models()
+        unmapped = [slug for slug, v in _current_models.get("llm", {}).items() if not v["openrouter_id"]]
+        for slug in unmapped:
+            print(f"  WARNING: {slug} has no OPENROUTER_IDS entry in curated.py — "
+                  "it won't be excluded from OpenRouter candidates")
+    return _current_models.get(model_type, {})
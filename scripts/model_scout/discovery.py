@@ -0,0 +1,180 @@
+"""
+Phases 1-2: OpenRouter discovery and Chutes cross-check.
+
+Both catalogs are read through the provider registry (providers.py), and
+OpenRouter candidates are matched to chutes on the same model identity that
+--matrix uses, so the report and the matrix agree on what counts as the same
+model.
+"""
+
+from .models import is_open_source
+from .providers import (
+    ChutesProvider, OpenRouterProvider, build_identity_index, family_index, find_identity,
+    parse_chutes_pricing, parse_or_cache_pricing, parse_or_pricing,
+)
+
+
+# ─── Phase 1: OpenRouter Discovery ─────────────────────────────────────────
+
+def discover_openrouter(
+    model_type: str = "llm",
+    max_input_price: float = 2.0,
+    max_output_price: float = 8.0,
+) -> list[dict]:
+    """
+    Discover open-source models on OpenRouter.
+    Returns sorted list of candidates with pricing.
+    """
+    print("  Fetching OpenRouter models...")
+    provider = OpenRouterProvider()
+    all_models = provider.fetch()
+    print(f"  Found {len(all_models)} total models")
+
+    candidates = []
+    for m in all_models:
+        mid = m.get("id", "")
+
+        # Skip free-tier variants (rate limited, not for production)
+        if mid.endswith(":free") or mid.endswith(":extended"):
+            continue
+
+        # Open-source only
+        if not is_open_source(mid):
+            continue
+
+        # Filter by modality
+        arch = m.get("architecture", {})
+        modality = arch.get("modality", "")
+
+        if model_type == "llm":
+            if not provider.is_chat_model(m):
+                continue
+        elif model_type == "embedding":
+            # OpenRouter doesn't really list embedding models, but check anyway
+            if "embedding" not in modality.lower() and "embed" not in mid.lower():
+                continue
+
+        p_in, p_out = parse_or_pricing(m)
+
+        # Price ceiling filter
+        if p_in > max_input_price or p_out > max_output_price:
+            continue
+
+        candidates.append({
+            "id": mid,
+            "name": m.get("name", mid),
+            "context_length": m.get("context_length", 0),
+            "price_in": p_in,
+            "price_out": p_out,
+            "price_cache_read": parse_or_cache_pricing(m),
+            "modality": modality,
+            "source": "openrouter",
+            # Changes when OpenRouter points the ID at a new upstream release
+            "version": str(m.get("canonical_slug") or m.get("created") or ""),
+        })
+
+    # Sort by input price ascending
+    candidates.sort(key=lambda c: (c["price_in"], c["price_out"]))
+    print(f"  {len(candidates)} open-source candidates within price range")
+    return candidates
+
+
+# ─── Phase 2: Chutes Cross-Check ───────────────────────────────────────────
+
+def crosscheck_chutes(
+    candidates: list[dict],
+    model_type: str = "llm",
+) -> tuple[list[dict], list[dict]]:
+    """
+    Check which OpenRouter candidates are also available on Chutes.
+    Returns (on_chutes, not_on_chutes) lists.
+    """
+    print("  Fetching Chutes catalog...")
+    provider = ChutesProvider()
+    chutes = provider.fetch()
+    print(f"  Found {len(chutes)} total chutes")
+
+    # Filter to vLLM template (actual LLM inference) or embedding
+    if model_type == "llm":
+        chutes = [c for c in chutes if provider.is_chat_model(c)]
+    elif model_type == "embedding":
+        chutes = [
+            c for c in chutes
+            if "embed" in c.get("name", "").lower()
+            or "bge" in c.get("name", "").lower()
+            or "e5" in c.get("name", "").lower()
+        ]
+
+    # Index chutes by model identity; keep the raw chute for its TEE/usage fields
+    index = build_identity_index({"chutes": [{**provider.to_entry(c), "raw": c} for c in chutes]})
+    families = family_index(index)
+
+    on_chutes = []
+    not_on_chutes = []
+
+    for cand in candidates:
+        identity = find_identity(cand["id"], index, families)
+        match = index[identity]["chutes"]["raw"] if identity else None
+
+        if match:
+            cp_in, cp_out = parse_chutes_pricing(match)
+            cand["chutes_slug"] = match.get("slug", "")
+            cand["chutes_name"] = match.get("name", "")
+            cand["chutes_price_in"] = cp_in
+            cand["chutes_price_out"] = cp_out
+            cand["chutes_tee"] = match.get("tee", False)
+            cand["chutes_invocations"] = match.get("invocation_count", 0)
+            on_chutes.append(cand)
+        else:
+            not_on_chutes.append(cand)
+
+    print(f"  {len(on_chutes)} candidates available on Chutes")
+    print(f"  {len(not_on_chutes)} candidates OpenRouter-only")
+    return on_chutes, not_on_chutes
+
+
+# ─── Chutes-direct discovery (for embeddings) ──────────────────────────────
+
+def discover_chutes_embeddings() -> tuple[list[dict], list[dict]]:
+    """
+    Discover embedding models directly from Chutes.
+    OpenRouter doesn't list embedding models, so we go to Chutes directly.
+    """
+    print("  Fetching Chutes catalog...")
+    chutes = ChutesProvider().fetch()
+    print(f"  Found {len(chutes)} total chutes")
+
+    # Filter to embedding-related chutes (exclude mining/affine noise and non-embedding models)
+    EMBED_KEYWORDS = ["embed", "bge", "e5-", "gte-"]
+    embedding_chutes = [
+        c for c in chutes
+        if any(kw in c.get("name", "").lower() for kw in EMBED_KEYWORDS)
+        and "affine" not in c.get("name", "").lower()
+        and "affine" not in c.get("slug", "").lower()
+        # Exclude models that just happen to match but aren't embedding models
+        and c.get("standard_template") != "vllm"
+    ]
+
+    print(f"  {len(embedding_chutes)} embedding models found")
+
+    on_chutes = []
+    for ch in embedding_chutes:
+        cp_in, cp_out = parse_chutes_pricing(ch)
+        on_chutes.append({
+            "id": ch.get("slug", ""),
+            "name": ch.get("name", ""),
+            "context_length": 0,  # Chutes doesn't expose this for embeddings
+            "price_in": cp_in,
+            "price_out": cp_out,
+            "modality": "embedding",
+            "source": "chutes",
+            "chutes_slug": ch.get("slug", ""),
+            "chutes_name": ch.get("name", ""),
+            "chutes_price_in": cp_in,
+            "chutes_price_out": cp_out,
+            "chutes_tee": ch.get("tee", False),
+            "chutes_invocations": ch.get("invocation_count", 0),
+        })
+
+    on_chutes.sort(key=lambda c: (c["price_in"], c["price_out"]))
+    return on_chutes, []  # No "not on chutes" for direct discovery
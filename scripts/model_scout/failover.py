@@ -0,0 +1,304 @@
+"""
+Failover-chain simulator.
+
+Benchmark and watch runs record every call's latency and errors per model in
+a profile store. The simulator replays a synthetic traffic trace through each
+candidate ordering (primary first, then fallbacks, as in src/lib/rag/service.ts)
+with a per-attempt timeout, and reports p95 latency, success rate and cost.
+
+Every model also gets an outage window (attempts hang until the timeout) and
+a slowdown window somewhere in the trace, so orderings are compared on how
+they behave when a model degrades, not just on the happy path. The windows
+stay well below 5% of the trace by default, so p95 still measures normal
+traffic rather than the incidents themselves. All orderings see the same
+random draws, so differences between them aren't sampling noise.
+"""
+
+import itertools
+import json
+import os
+import random
+import re
+import statistics
+import time
+
+from .config import CACHE_DIR, RAG_SERVICE_TS
+
+PROFILE_FILE = CACHE_DIR / "latency-profiles.json"
+PROFILE_MAX_SAMPLES = 500  # Most recent observations kept per model
+MIN_PROFILE_SAMPLES = 5
+SLOWDOWN_FACTOR = 3.0
+REPORTED_QUANTILE = 0.95
+# Outage + slowdown share above this lets the incident windows decide p95 on their own
+MAX_INCIDENT_SHARE = (1 - REPORTED_QUANTILE) / 2
+P95_RESOLUTION_S = 0.1  # p95 differences below this fall through to cost in the ranking
+
+_TS_STRING_CONST_RE = re.compile(r"const (\w+)\s*=\s*'([^']+)'")
+_TS_LIST_RE = re.compile(r"(\w+):\s*\[([^\]]*)\]")
+_TS_STRING_RE = re.compile(r"'([^']+)'")
+
+
+# ─── Profiles ───────────────────────────────────────────────────────────────
+
+def load_profiles(path=PROFILE_FILE) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def record_observations(model_id: str, details: list[dict], pricing: tuple = None, path=PROFILE_FILE):
+    """Add one benchmark pass's per-call latencies, errors and token counts to the store."""
+    profiles = load_profiles(path)
+    p = profiles.setdefault(model_id, {
+        "latency_s": [], "calls": 0, "errors": 0,
+        "prompt_tokens": [], "completion_tokens": [],
+    })
+    for d in details:
+        p["calls"] += 1
+        if "error" in d:
+            p["errors"] += 1
+            continue
+        if d.get("aborted"):
+            continue  # Cut short by early abort — not a real response time
+        p["latency_s"].append(round(d["latency_s"], 3))
+        usage = d.get("usage") or {}
+        p["prompt_tokens"].append(usage.get("prompt_tokens", 0))
+        p["completion_tokens"].append(usage.get("completion_tokens", 0))
+    for key in ("latency_s", "prompt_tokens", "completion_tokens"):
+        p[key] = p[key][-PROFILE_MAX_SAMPLES:]
+    if pricing:
+        p["price_in"], p["price_out"] = pricing
+    p["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(profiles, f)
+    except OSError:
+        pass  # Profiles are best-effort
+
+
+def production_chain(provider: str = "openrouter", ts_path=RAG_SERVICE_TS) -> list[str]:
+    """
+    The models processQuery() in service.ts tries, in order: BOT_MODEL (or the
+    provider's default), then BOT_FALLBACK_MODELS (or DEFAULT_FALLBACK_MODELS).
+    Returns [] if service.ts can't be read.
+    """
+    try:
+        source = ts_path.read_text()
+    except OSError:
+        return []
+    consts = dict(_TS_STRING_CONST_RE.findall(source))
+    primary = os.environ.get("BOT_MODEL") or consts.get(
+        "CHUTES_DEFAULT_MODEL" if provider == "chutes" else "OPENROUTER_DEFAULT_MODEL"
+    )
+    env_fallbacks = os.environ.get("BOT_FALLBACK_MODELS")
+    if env_fallbacks:
+        fallbacks = [m.strip() for m in env_fallbacks.split(",") if m.strip()]
+    else:
+        start = source.find("const DEFAULT_FALLBACK_MODELS")
+        block = source[start:source.find("};", start)] if start != -1 else ""
+        lists = {name: _TS_STRING_RE.findall(body) for name, body in _TS_LIST_RE.findall(block)}
+        fallbacks = lists.get(provider) or lists.get("openrouter", [])
+    return [m for m in [primary, *fallbacks] if m]
+
+
+# ─── Simulation ─────────────────────────────────────────────────────────────
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def _window(rng: random.Random, n: int, share: float) -> range:
+    length = int(n * share)
+    start = rng.randrange(0, max(1, n - length))
+    return range(start, start + length)
+
+
+def draw_trace(profiles: dict, models: list[str], n: int, outage_share: float,
+               slowdown_share: float, seed: int = 0) -> dict:
+    """
+    Pre-draw each model's behaviour for every request in the trace:
+    {model: [(latency_s, failed, outage), ...]}.
+    """
+    rng = random.Random(seed)
+    trace = {}
+    for m in models:
+        p = profiles[m]
+        err_rate = p["errors"] / max(1, p["calls"])
+        outage = set(_window(rng, n, outage_share))
+        slow = set(_window(rng, n, slowdown_share))
+        draws = []
+        for r in range(n):
+            latency = rng.choice(p["latency_s"])
+            if r in slow:
+                latency *= SLOWDOWN_FACTOR
+            failed = rng.random() < err_rate
+            if failed:
+                latency *= rng.random()  # Errors surface partway through
+            draws.append((latency, failed, r in outage))
+        trace[m] = draws
+    return trace
+
+
+def _attempt_outcomes(profile: dict, draws: list[tuple], timeout: float) -> list[tuple]:
+    """
+    Per request: (seconds spent, succeeded, cost) for one attempt on this model.
+    Costs are computed at $0 for unpriced models; simulate_chain reports those chains' cost as unknown.
+    """
+    p_in, p_out = profile.get("price_in") or 0.0, profile.get("price_out") or 0.0
+    prompt = statistics.fmean(profile["prompt_tokens"]) if profile["prompt_tokens"] else 0
+    completion = statistics.fmean(profile["completion_tokens"]) if profile["completion_tokens"] else 0
+    full_cost = (prompt * p_in + completion * p_out) / 1_000_000
+    outcomes = []
+    for latency, failed, outage in draws:
+        if outage:
+            outcomes.append((timeout, False, 0.0))  # Hangs until the caller gives up
+        elif failed:
+            outcomes.append((min(latency, timeout), False, 0.0))
+        elif latency > timeout:
+            # Abandoned mid-generation: prompt and the partial answer are still billed
+            outcomes.append((timeout, False, full_cost * (0.5 + 0.5 * timeout / latency)))
+        else:
+            outcomes.append((latency, True, full_cost))
+    return outcomes
+
+
+def simulate_chain(outcomes: dict, chain: tuple, n: int, priced: set = None) -> dict:
+    """Replay the trace through one ordering. Cost is None unless every model in `priced`."""
+    latencies, cost, successes = [], 0.0, 0
+    for r in range(n):
+        spent = 0.0
+        for m in chain:
+            dt, ok, c = outcomes[m][r]
+            spent += dt
+            cost += c
+            if ok:
+                successes += 1
+                break
+        latencies.append(spent)
+    return {
+        "chain": list(chain),
+        "success_rate": successes / n,
+        "p50_s": _percentile(latencies, 0.50),
+        "p95_s": _percentile(latencies, REPORTED_QUANTILE),
+        "cost_per_1k_usd": cost / n * 1000 if priced is None or priced.issuperset(chain) else None,
+    }
+
+
+def simulate_failover(
+    profiles: dict,
+    models: list[str],
+    chain_length: int = 3,
+    timeouts: list[float] = (10.0, 20.0, 30.0),
+    requests: int = 5000,
+    outage_share: float = 0.01,
+    slowdown_share: float = 0.01,
+    current_chain: list[str] = None,
+    seed: int = 0,
+) -> dict:
+    """
+    Simulate every ordering of `chain_length` models (and each timeout).
+    Ranked by success rate, then p95 (to P95_RESOLUTION_S), then cost; chains
+    with an unpriced model rank after priced ones on cost, and the current chain
+    wins full ties. The first is the recommendation.
+    """
+    trace = draw_trace(profiles, models, requests, outage_share, slowdown_share, seed)
+    priced = {m for m in models if profiles[m].get("price_in") is not None}
+    results = []
+    for timeout in timeouts:
+        outcomes = {m: _attempt_outcomes(profiles[m], trace[m], timeout) for m in models}
+        for chain in itertools.permutations(models, min(chain_length, len(models))):
+            r = simulate_chain(outcomes, chain, requests, priced)
+            r["timeout_s"] = timeout
+            results.append(r)
+        if current_chain and all(m in outcomes for m in current_chain):
+            r = simulate_chain(outcomes, tuple(current_chain), requests, priced)
+            r["timeout_s"] = timeout
+            r["current"] = True
+            if not any(x["chain"] == r["chain"] and x["timeout_s"] == timeout for x in results):
+                results.append(r)
+            else:
+                for x in results:
+                    if x["chain"] == r["chain"] and x["timeout_s"] == timeout:
+                        x["current"] = True
+
+    results.sort(key=lambda r: (
+        -round(r["success_rate"], 3),
+        round(r["p95_s"] / P95_RESOLUTION_S),
+        r["cost_per_1k_usd"] is None,
+        r["cost_per_1k_usd"] or 0.0,
+        not r.get("current"),  # On a full tie, keep what production already runs
+    ))
+    return {
+        "requests": requests,
+        "outage_share": outage_share,
+        "slowdown_share": slowdown_share,
+        "models": {
+            m: {
+                "samples": len(profiles[m]["latency_s"]),
+                "error_rate": round(profiles[m]["errors"] / max(1, profiles[m]["calls"]), 4),
+                "p50_s": round(_percentile(profiles[m]["latency_s"], 0.5), 3),
+                "p95_s": round(_percentile(profiles[m]["latency_s"], 0.95), 3),
+                "price_in": profiles[m].get("price_in"),
+                "price_out": profiles[m].get("price_out"),
+            }
+            for m in models
+        },
+        "orderings": results,
+        "recommended": results[0] if results else None,
+    }
+
+
+def usable_models(profiles: dict, wanted: list[str] = None) -> tuple[list[str], list[str]]:
+    """Split the wanted models (default: all profiled) into (usable, too few samples)."""
+    wanted = wanted or list(profiles)
+    usable = [m for m in wanted if len(profiles.get(m, {}).get("latency_s", [])) >= MIN_PROFILE_SAMPLES]
+    return usable, [m for m in wanted if m not in usable]
+
+
+def print_failover_report(sim: dict, top: int = 10):
+    """Print per-model inputs, the best orderings and the current chain."""
+    print()
+    print("=" * 110)
+    print(f"  FAILOVER SIMULATION — {sim['requests']:,} requests, each model down for "
+          f"{sim['outage_share']:.1%} and {SLOWDOWN_FACTOR:.0f}x slow for {sim['slowdown_share']:.1%} of the trace")
+    print("=" * 110)
+    print(f"  {'Model':<50} {'Samples':>8} {'Errors':>8} {'p50':>8} {'p95':>8} {'$/M In':>9} {'$/M Out':>9}")
+    print("  " + "-" * 106)
+    for m, s in sim["models"].items():
+        prices = (
+            f"${s['price_in']:>8.3f} ${s['price_out']:>8.3f}" if s["price_in"] is not None
+            else f"{'—':>9} {'—':>9}"
+        )
+        print(
+            f"  {m[:49]:<50} {s['samples']:>8} {s['error_rate']:>8.1%} "
+            f"{s['p50_s']:>7.2f}s {s['p95_s']:>7.2f}s {prices}"
+        )
+
+    print(f"\n  {'#':>3} {'Chain':<62} {'Timeout':>8} {'Success':>8} {'p95':>8} {'$/1k req':>9}")
+    print("  " + "-" * 106)
+    shown = sim["orderings"][:top] + [
+        r for r in sim["orderings"][top:] if r.get("current")
+    ]
+    for r in shown:
+        rank = sim["orderings"].index(r) + 1
+        chain = " → ".join(m.rsplit("/", 1)[-1] for m in r["chain"])
+        tag = "  ← current" if r.get("current") else ""
+        cost = f"${r['cost_per_1k_usd']:>8.3f}" if r["cost_per_1k_usd"] is not None else f"{'—':>9}"
+        print(
+            f"  {rank:>3} {chain[:61]:<62} {r['timeout_s']:>7g}s {r['success_rate']:>8.2%} "
+            f"{r['p95_s']:>7.2f}s {cost}{tag}"
+        )
+    print("  " + "-" * 106)
+    best = sim["recommended"]
+    if best:
+        print(f"  Recommended: {' → '.join(best['chain'])} with a {best['timeout_s']:g}s per-attempt timeout"
+              + (" (cost unknown)" if best["cost_per_1k_usd"] is None else ""))
+    print(f"  Ranked by success rate, then p95 latency (to {P95_RESOLUTION_S:g}s), then cost. "
+          "Latency = time until an answer or give-up.")
+    if any(s["price_in"] is None for s in sim["models"].values()):
+        print("  Chains with an unpriced model (—) have no cost and rank after priced chains on cost.")
+    print("=" * 110)
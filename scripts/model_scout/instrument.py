@@ -0,0 +1,196 @@
+"""
+Span timing for phases, HTTP calls and benchmark prompts.
+
+Spans are always recorded (the overhead is a few perf_counter calls);
+--trace-out exports them and --profile wraps the run in cProfile or tracemalloc.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Span:
+    __slots__ = (
+        "name", "attrs", "span_id", "parent_id",
+        "start_ns", "end_ns", "_t0", "duration_s", "error",
+    )
+
+    def __init__(self, name: str, attrs: dict, parent_id: str = None):
+        self.name = name
+        self.attrs = attrs
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self._t0 = time.perf_counter()
+        self.duration_s = None
+        self.error = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_s": self.duration_s,
+            "attrs": self.attrs,
+            "error": self.error,
+        }
+
+
+class Tracer:
+    """Collects finished spans; nesting is tracked per thread."""
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        stack = self._stack()
+        s = Span(name, attrs, stack[-1].span_id if stack else None)
+        stack.append(s)
+        try:
+            yield s
+        except GeneratorExit:
+            # The consumer closed a streaming generator on purpose (early abort,
+            # TTFT probe) — a normal end, not a failure
+            s.set(aborted=True)
+            raise
+        except BaseException as e:
+            s.error = f"{type(e).__name__}: {str(e)[:200]}"
+            raise
+        finally:
+            s.duration_s = time.perf_counter() - s._t0
+            s.end_ns = s.start_ns + int(s.duration_s * 1e9)
+            stack.pop()
+            with self._lock:
+                self.spans.append(s)
+
+    def to_json(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "spans": [s.to_dict() for s in sorted(self.spans, key=lambda s: s.start_ns)],
+        }
+
+    def to_otlp(self) -> dict:
+        """OTLP/JSON trace export (load with any OpenTelemetry collector or viewer)."""
+        def attr(key, value):
+            if isinstance(value, bool):
+                v = {"boolValue": value}
+            elif isinstance(value, int):
+                v = {"intValue": str(value)}
+            elif isinstance(value, float):
+                v = {"doubleValue": value}
+            else:
+                v = {"stringValue": str(value)}
+            return {"key": key, "value": v}
+
+        spans = []
+        for s in sorted(self.spans, key=lambda s: s.start_ns):
+            span = {
+                "traceId": self.trace_id,
+                "spanId": s.span_id,
+                "name": s.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns),
+                "attributes": [attr(k, v) for k, v in s.attrs.items() if v is not None],
+                "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+            }
+            if s.parent_id:
+                span["parentSpanId"] = s.parent_id
+            spans.append(span)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [attr("service.name", "model-scout")]},
+                "scopeSpans": [{"scope": {"name": "model_scout"}, "spans": spans}],
+            }]
+        }
+
+    def write(self, path: str, fmt: str = "json"):
+        data = self.to_otlp() if fmt == "otlp" else self.to_json()
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+TRACER = Tracer()
+
+
+def span(name: str, **attrs):
+    """Time a block as a span on the global tracer: `with span("phase.x") as s: ...`"""
+    return TRACER.span(name, **attrs)
+
+
+def print_span_summary(tracer: Tracer = TRACER, file=None):
+    """Print per-phase durations and HTTP totals."""
+    phases = [s for s in tracer.spans if s.name.startswith("phase.")]
+    http = [s for s in tracer.spans if s.name.startswith("http.")]
+    prompts = [s for s in tracer.spans if s.name == "benchmark.prompt"]
+    if not (phases or http):
+        return
+    print("\n  TIMING", file=file)
+    print("  " + "-" * 60, file=file)
+    for s in sorted(phases, key=lambda s: s.start_ns):
+        print(f"  {s.name:<40} {s.duration_s:>8.2f}s", file=file)
+    if http:
+        total_bytes = sum(s.attrs.get("bytes", 0) for s in http)
+        total_time = sum(s.duration_s for s in http)
+        slowest = max(http, key=lambda s: s.duration_s)
+        print(
+            f"  {len(http)} HTTP calls, {total_bytes / 1024:,.0f} KiB, {total_time:.2f}s total "
+            f"(slowest {slowest.duration_s:.2f}s: {slowest.attrs.get('url', '')[:60]})",
+            file=file,
+        )
+    if prompts:
+        durations = sorted(s.duration_s for s in prompts)
+        p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+        print(f"  {len(prompts)} benchmark prompts, p95 {p95:.2f}s", file=file)
+
+
+@contextmanager
+def profiled(mode: str, out_path: str):
+    """Run a block under cProfile or tracemalloc and write the result to out_path."""
+    if mode == "cprofile":
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(out_path)
+            with open(out_path + ".txt", "w") as f:
+                pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(40)
+    elif mode == "tracemalloc":
+        import tracemalloc
+
+        tracemalloc.start(25)
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(out_path, "w") as f:
+                f.write(f"current {current / 1024:,.0f} KiB, peak {peak / 1024:,.0f} KiB\n\n")
+                for stat in snapshot.statistics("lineno")[:40]:
+                    f.write(f"{stat}\n")
+    else:
+        yield
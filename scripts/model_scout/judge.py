@@ -0,0 +1,230 @@
+"""
+Optional LLM-as-judge stage for benchmark answers.
+
+Keyword scoring can't tell a fluent correct answer from one that merely
+contains the right words, so --judge grades each answer with a judge model
+(the same default as scripts/eval/judge.ts, or any OpenAI-compatible
+endpoint via --judge-url). Answers are graded concurrently, and judgments
+are cached by a hash of judge endpoint + model + rubric prompt (criteria and
+answer included), so re-runs never pay twice for the same grading.
+"""
+
+import hashlib
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from .api import BENCHMARK_URL, post_json
+from .config import CACHE_DIR
+from .instrument import span
+from .prompts import BENCHMARK_PROMPTS
+from .scoring import strip_thinking
+from .usage import BudgetExceeded, UsageLedger, extract_usage
+
+DEFAULT_JUDGE_MODEL = "anthropic/claude-sonnet-4.5"  # Same default as scripts/eval/judge.ts
+JUDGE_PROMPT_VERSION = 1  # Bump when the rubric changes to invalidate cached judgments
+JUDGE_MAX_TOKENS = 400
+JUDGE_WORKERS = 8
+
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def build_judge_prompt(test: dict, answer: str) -> str:
+    """Rubric prompt for one benchmark answer; asks for a JSON verdict."""
+    checks = []
+    if test.get("must_mention"):
+        checks.append(
+            "It covers these concepts (semantic equivalence counts): "
+            + ", ".join(
+                c if isinstance(c, str) else "any one of (" + " / ".join(c) + ")"
+                for c in test["must_mention"]
+            )
+        )
+    if test.get("must_not_mention"):
+        checks.append(
+            "It does NOT claim or imply any of: " + "; ".join(test["must_not_mention"])
+        )
+    if test.get("should_decline"):
+        checks.append("It politely declines the off-topic question and redirects to Quilibrium")
+    if test.get("is_correction_test"):
+        checks.append(
+            "It acknowledges the user's correction (or offers to verify/flag it) "
+            "rather than insisting on its previous answer"
+        )
+    if test.get("tone"):
+        checks.append(f"Its tone fits Quily (dry, casual crypto-veteran) and reads as \"{test['tone']}\"")
+    if test.get("max_sentences"):
+        checks.append(f"It respects the requested length (at most {test['max_sentences']} sentences)")
+    checks.append("It is factually accurate about Quilibrium and does not invent features")
+
+    conversation = "".join(
+        f"{m['role'].upper()}: {m['content']}\n" for m in test.get("setup_messages", [])
+    )
+    return f"""You are a QA evaluator for "Quily", a chatbot about the Quilibrium protocol.
+
+Quilibrium facts: proof-of-meaningful-work consensus, multi-party computation (MPC),
+no staking, no EVM/Solidity, not an L1/L2 blockchain.
+
+## Test
+- ID: {test['id']}
+- Goal: {test.get('description', '')}
+
+## Conversation
+{conversation}USER: {test['prompt']}
+
+## Answer being graded
+{answer or '(empty response)'}
+
+## Evaluation Task
+Check that:
+""" + "\n".join(f"{i}. {c}" for i, c in enumerate(checks, 1)) + """
+
+Reply with only a JSON object:
+{"passed": true|false, "score": <0.0-1.0>, "reasoning": "<one sentence>"}"""
+
+
+def parse_judgment(text: str) -> dict:
+    """Extract {passed, score, reasoning} from the judge's reply."""
+    match = _JSON_OBJECT_RE.search(text or "")
+    if not match:
+        raise ValueError(f"judge returned no JSON: {(text or '')[:80]!r}")
+    data = json.loads(match.group(0))
+    score = min(1.0, max(0.0, float(data.get("score", 0))))
+    return {
+        "passed": bool(data.get("passed", score >= 0.5)),
+        "score": round(score, 3),
+        "reasoning": str(data.get("reasoning", ""))[:300],
+    }
+
+
+def judgment_key(judge_model: str, test: dict, answer: str, judge_url: str = None) -> str:
+    """Cache key: the judge endpoint and model plus the full rubric prompt (criteria included)."""
+    h = hashlib.sha256()
+    parts = (
+        judge_url or BENCHMARK_URL, judge_model, f"v{JUDGE_PROMPT_VERSION}",
+        test["id"], build_judge_prompt(test, answer),
+    )
+    for part in parts:
+        h.update(part.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def judge_answer(
+    test: dict,
+    answer: str,
+    judge_model: str,
+    api_key: str,
+    judge_url: str = None,
+) -> dict:
+    """Grade one answer. Returns the judgment plus the call's token usage."""
+    payload = {
+        "model": judge_model,
+        "messages": [{"role": "user", "content": build_judge_prompt(test, answer)}],
+        "max_tokens": JUDGE_MAX_TOKENS,
+        "temperature": 0,
+    }
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+    with span("benchmark.judge", judge=judge_model, test=test["id"]) as s:
+        body = post_json(judge_url or BENCHMARK_URL, payload, headers=headers)
+        text = ((body.get("choices") or [{}])[0].get("message") or {}).get("content") or ""
+        judgment = parse_judgment(text)
+        s.set(score=judgment["score"])
+    return {**judgment, "usage": extract_usage(body)}
+
+
+def judge_results(
+    results: dict,
+    judge_model: str = DEFAULT_JUDGE_MODEL,
+    api_key: str = "",
+    judge_url: str = None,
+    ledger: UsageLedger = None,
+    workers: int = JUDGE_WORKERS,
+    prompts: list[dict] = None,
+) -> dict:
+    """
+    Grade every benchmarked answer in `results` (from run_benchmarks) in place.
+    Adds `judge` to each detail and `judge_score` (mean 0-1) to each model.
+    """
+    tests = {t["id"]: t for t in prompts or BENCHMARK_PROMPTS}
+    cache_file = CACHE_DIR / "judgments.json"
+    try:
+        with open(cache_file) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    # One job per distinct (test, answer); identical answers share a judgment
+    jobs = {}
+    for result in results.values():
+        for d in result["details"]:
+            if d.get("response") is None or d["test"] not in tests:
+                continue
+            test = tests[d["test"]]
+            answer = strip_thinking(d["response"])
+            d["_judge_key"] = key = judgment_key(judge_model, test, answer, judge_url)
+            if key not in cache:
+                jobs[key] = (test, answer)
+
+    n_answers = sum(1 for r in results.values() for d in r["details"] if "_judge_key" in d)
+    print(f"\n  Judging {n_answers} answers with {judge_model} "
+          f"({n_answers - len(jobs)} cached, {len(jobs)} to grade)...")
+
+    if jobs:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {}
+            reserved = {}
+            for key, (test, answer) in jobs.items():
+                if ledger:
+                    # Reserve each job's worst case now: spend is only recorded
+                    # once results come back, after everything is submitted
+                    messages = [{"role": "user", "content": build_judge_prompt(test, answer)}]
+                    try:
+                        reserved[key] = ledger.check(judge_model, messages, JUDGE_MAX_TOKENS, reserve=True)
+                    except BudgetExceeded as e:
+                        print(f"  Budget reached, remaining answers left ungraded: {e}")
+                        break
+                futures[key] = pool.submit(
+                    judge_answer, test, answer, judge_model, api_key, judge_url
+                )
+            errors = 0
+            for key, fut in futures.items():
+                try:
+                    judgment = fut.result()
+                except Exception as e:
+                    errors += 1
+                    if errors == 1:
+                        print(f"  Judge error: {str(e)[:100]}")
+                    continue
+                finally:
+                    if ledger:
+                        ledger.release(reserved[key])
+                if ledger:
+                    ledger.record(judge_model, "judge", judgment.pop("usage"))
+                else:
+                    judgment.pop("usage")
+                cache[key] = judgment
+            if errors:
+                print(f"  {errors} answer(s) could not be graded")
+
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, "w") as f:
+                json.dump(cache, f, indent=2)
+        except OSError:
+            pass  # Cache is best-effort
+
+    for mid, result in results.items():
+        scores = []
+        for d in result["details"]:
+            key = d.pop("_judge_key", None)
+            if key in cache:
+                d["judge"] = cache[key]
+                scores.append(cache[key]["score"])
+        if scores:
+            result["judge_score"] = round(sum(scores) / len(scores), 3)
+            result["judge_model"] = judge_model
+            print(f"    {mid}: judge {result['judge_score']:.2f} "
+                  f"({sum(1 for d in result['details'] if d.get('judge', {}).get('passed'))}"
+                  f"/{len(scores)} passed)")
+    return results
@@ -0,0 +1,186 @@
+"""
+Provider-side prompt-prefix cache probe.
+
+Production prompts share a long prefix (system prompt + retrieved docs), so a
+provider that caches prefixes answers repeated requests cheaper and faster.
+For each candidate this sends one cold call with a freshly salted prefix, then
+a few warm calls that reuse the prefix with different questions, and compares
+the reported cached_tokens and time-to-first-token. Answers are capped at a
+few tokens so TTFT is dominated by prefill.
+"""
+
+import os
+import statistics
+import uuid
+
+from .instrument import span
+from .rag import DEFAULT_SNAPSHOT, build_rag_messages, load_rag_snapshot
+from .usage import BudgetExceeded, UsageLedger
+
+PREFIX_TOKENS = 4096  # Above every provider's minimum cacheable prefix (1024-2048)
+CACHE_PROBE_MAX_TOKENS = 16
+FASTER_RATIO = 0.85  # Warm TTFT must beat cold by 15% to count as faster
+
+
+def build_prefix(prompts: list[dict], snapshot_path=DEFAULT_SNAPSHOT) -> str:
+    """A production-shaped RAG system prompt to share across the probe's calls."""
+    snapshot = load_rag_snapshot(prompts[:1], snapshot_path)
+    queries = snapshot["queries"]
+    ranked = queries.get(prompts[0]["id"], [])
+    filler = [ch for chunks in queries.values() for ch in chunks]
+    messages, _ = build_rag_messages(
+        prompts[0], ranked, filler, PREFIX_TOKENS, max_tokens=CACHE_PROBE_MAX_TOKENS
+    )
+    return messages[0]["content"]
+
+
+def probe_prefix_cache(
+    candidate: dict,
+    api_key: str,
+    prefix: str,
+    questions: list[str],
+    ledger: UsageLedger = None,
+) -> dict:
+    """One cold call, then len(questions) - 1 warm calls sharing the same system prefix."""
+    from .benchmark import stream_completion
+
+    mid = candidate["id"]
+    # Salt the prefix so the cold call can't hit a cache left by an earlier run
+    system = f"Session {uuid.uuid4().hex[:12]}\n\n{prefix}"
+    calls = []
+    for i, question in enumerate(questions):
+        messages = [{"role": "system", "content": system}, {"role": "user", "content": question}]
+        if ledger:
+            ledger.check(mid, messages, CACHE_PROBE_MAX_TOKENS)
+        with span("benchmark.cache_probe", model=mid, warm=i > 0) as s:
+            completion = stream_completion(mid, api_key, messages, max_tokens=CACHE_PROBE_MAX_TOKENS)
+            usage = completion["usage"]
+            s.set(ttft_s=completion["ttft_s"], cached_tokens=usage["cached_tokens"])
+        if ledger:
+            ledger.record(mid, "prefix-cache", usage)
+        calls.append({
+            "warm": i > 0,
+            "prompt_tokens": usage["prompt_tokens"],
+            "cached_tokens": usage["cached_tokens"],
+            "usage_estimated": completion["usage_estimated"],
+            "ttft_s": completion["ttft_s"],
+        })
+    return summarize_probe(candidate, calls)
+
+
+def summarize_probe(candidate: dict, calls: list[dict]) -> dict:
+    cold, warm = calls[0], calls[1:]
+    warm_ttfts = [c["ttft_s"] for c in warm if c["ttft_s"] is not None]
+    ttft_warm = statistics.median(warm_ttfts) if warm_ttfts else None
+    hit_rate = (
+        sum(c["cached_tokens"] for c in warm) / max(1, sum(c["prompt_tokens"] for c in warm))
+        if warm else 0.0
+    )
+
+    p_in = candidate.get("price_in") or 0.0
+    p_cache = candidate.get("price_cache_read")
+    # Warm input cost relative to paying full price for every prompt token
+    if p_in and p_cache is not None and hit_rate:
+        cost_ratio = (1 - hit_rate) + hit_rate * p_cache / p_in
+    else:
+        cost_ratio = 1.0
+
+    faster = (
+        ttft_warm is not None and cold["ttft_s"] is not None
+        and ttft_warm < cold["ttft_s"] * FASTER_RATIO
+    )
+    cheaper = cost_ratio < 0.99
+    if hit_rate == 0:
+        verdict = "no cache hits"
+    elif cheaper and faster:
+        verdict = "cheaper + faster"
+    elif cheaper:
+        verdict = "cheaper"
+    elif faster:
+        verdict = "faster"
+    else:
+        verdict = "hits, no gain"
+    return {
+        "calls": calls,
+        "hit_rate": round(hit_rate, 3),
+        "ttft_cold_s": cold["ttft_s"],
+        "ttft_warm_s": ttft_warm,
+        "price_in": p_in,
+        "price_cache_read": p_cache,
+        "warm_input_cost_ratio": round(cost_ratio, 3),
+        "usage_estimated": any(c["usage_estimated"] for c in calls),
+        "verdict": verdict,
+    }
+
+
+def run_cache_probes(
+    candidates: list[dict],
+    prompts: list[dict],
+    warm_calls: int = 3,
+    max_models: int = 5,
+    snapshot_path=DEFAULT_SNAPSHOT,
+    ledger: UsageLedger = None,
+) -> dict:
+    """Probe prefix caching for the top non-reasoning candidates."""
+    from .models import extract_model_size
+    from .probe import classify_candidates
+
+    api_key = os.environ.get("OPENROUTER_API_KEY", "")
+    if not api_key:
+        print("\n  WARNING: OPENROUTER_API_KEY not set. Skipping prefix-cache probe.")
+        return {}
+
+    ranked = sorted(candidates, key=lambda c: -extract_model_size(c["name"]))
+    if ledger:
+        for c in ranked:
+            ledger.set_pricing(c)
+    probes = classify_candidates(ranked, api_key, ledger, limit=max_models)
+    models = [c for c in ranked if probes.get(c["id"], {}).get("classification") in ("chat", "hybrid")]
+
+    prefix = build_prefix(prompts, snapshot_path)
+    questions = [t["prompt"] for t in prompts]
+    questions = [questions[i % len(questions)] for i in range(warm_calls + 1)]
+    print(f"  Shared prefix ~{len(prefix) // 4:,} tokens; 1 cold + {warm_calls} warm calls per model")
+
+    results = {}
+    for c in models[:max_models]:
+        print(f"    {c['id']}...", end=" ", flush=True)
+        try:
+            r = probe_prefix_cache(c, api_key, prefix, questions, ledger)
+        except BudgetExceeded as e:
+            print(f"stopped\n  Budget reached: {e}")
+            break
+        except Exception as e:
+            print(f"error: {str(e)[:80]}")
+            continue
+        results[c["id"]] = r
+        print(f"{r['verdict']} (cached {r['hit_rate']:.0%} of warm prompt tokens)")
+    return results
+
+
+def print_cache_report(results: dict):
+    """Print which models give cheaper/faster repeated-prefix requests."""
+    if not results:
+        return
+    print()
+    print("=" * 110)
+    print("  PROMPT-PREFIX CACHE")
+    print("=" * 110)
+    print(
+        f"  {'Model':<40} {'Cached':>7} {'TTFT cold':>10} {'TTFT warm':>10} "
+        f"{'$/M In':>8} {'$/M Cache':>10} {'Warm in$':>9}  Verdict"
+    )
+    print("  " + "-" * 106)
+    order = sorted(results.items(), key=lambda kv: (kv[1]["warm_input_cost_ratio"], -kv[1]["hit_rate"]))
+    for mid, r in order:
+        cold = f"{r['ttft_cold_s']:.2f}s" if r["ttft_cold_s"] is not None else "—"
+        warm = f"{r['ttft_warm_s']:.2f}s" if r["ttft_warm_s"] is not None else "—"
+        cache_price = f"${r['price_cache_read']:.3f}" if r["price_cache_read"] is not None else "—"
+        print(
+            f"  {mid[:39]:<40} {r['hit_rate']:>7.0%} {cold:>10} {warm:>10} "
+            f"${r['price_in']:>7.3f} {cache_price:>10} {r['warm_input_cost_ratio']:>8.0%}  {r['verdict']}"
+        )
+    print("  " + "-" * 106)
+    print("  Cached = share of warm-call prompt tokens served from the provider's prefix cache")
+    print("  Warm in$ = warm-call input cost vs. full price; OpenRouter may route calls to different upstreams")
+    print("=" * 110)
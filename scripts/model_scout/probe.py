@@ -0,0 +1,197 @@
+"""Measured reasoning-behaviour probe for benchmark candidates."""
+
+import json
+import time
+
+from .api import BENCHMARK_URL, stream_sse_json
+from .config import CACHE_DIR
+from .instrument import span
+from .models import is_reasoning_model
+from .usage import BudgetExceeded, UsageLedger, estimate_tokens, extract_usage
+
+
+# ─── Reasoning probe ───────────────────────────────────────────────────────
+
+PROBE_PROMPT = "In one sentence, what is a peer-to-peer network?"
+PROBE_MAX_TOKENS = 512
+PROBE_VERSION = 1  # Bump to invalidate cached probe results
+
+# Classification thresholds: hidden reasoning tokens / seconds spent before
+# the first visible token that mark a model as too slow for chatbot use
+REASONING_TOKEN_THRESHOLD = 64
+REASONING_DELAY_THRESHOLD = 4.0
+
+# max_tokens per classification — chat models don't need room for a <think> block
+BENCHMARK_MAX_TOKENS = {
+    "chat": 800,
+    "hybrid": 1500,
+    "reasoning": 1500,
+}
+
+
+def probe_reasoning(model_id: str, api_key: str, ledger: UsageLedger = None) -> dict:
+    """
+    Stream one short prompt and measure hidden reasoning vs visible output.
+
+    Hidden reasoning is counted from `reasoning` deltas, inline <think> blocks
+    and the usage block's reasoning_tokens, whichever reports more.
+    """
+    messages = [{"role": "user", "content": PROBE_PROMPT}]
+    if ledger:
+        ledger.check(model_id, messages, PROBE_MAX_TOKENS)
+
+    payload = {
+        "model": model_id,
+        "messages": messages,
+        "max_tokens": PROBE_MAX_TOKENS,
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+    start = time.perf_counter()
+    first_token_at = None
+    first_visible_at = None
+    hidden_chars = 0
+    visible = ""
+    in_think = False
+    usage = None
+
+    for chunk in stream_sse_json(
+        BENCHMARK_URL, payload, headers={"Authorization": f"Bearer {api_key}"}
+    ):
+        if chunk.get("usage"):
+            usage = extract_usage(chunk)
+        for choice in chunk.get("choices") or []:
+            delta = choice.get("delta") or {}
+            reasoning = delta.get("reasoning") or delta.get("reasoning_content") or ""
+            content = delta.get("content") or ""
+            if (reasoning or content) and first_token_at is None:
+                first_token_at = time.perf_counter()
+            hidden_chars += len(reasoning)
+
+            # Split inline <think> blocks out of the content stream
+            while content:
+                if in_think:
+                    end = content.find("</think>")
+                    if end == -1:
+                        hidden_chars += len(content)
+                        content = ""
+                    else:
+                        hidden_chars += end
+                        content = content[end + len("</think>"):]
+                        in_think = False
+                else:
+                    begin = content.find("<think>")
+                    text = content if begin == -1 else content[:begin]
+                    if text.strip() and first_visible_at is None:
+                        first_visible_at = time.perf_counter()
+                    visible += text
+                    if begin == -1:
+                        content = ""
+                    else:
+                        content = content[begin + len("<think>"):]
+                        in_think = True
+
+    end = time.perf_counter()
+    usage = usage or {"prompt_tokens": estimate_tokens(messages),
+                      "completion_tokens": (hidden_chars + len(visible)) // 4,
+                      "reasoning_tokens": 0, "cached_tokens": 0}
+    if ledger:
+        ledger.record(model_id, "reasoning-probe", usage)
+
+    hidden_tokens = max(usage["reasoning_tokens"], hidden_chars // 4)
+    ttft = (first_token_at - start) if first_token_at else None
+    visible_ttft = (first_visible_at - start) if first_visible_at else None
+    think_delay = (
+        (first_visible_at or end) - first_token_at if first_token_at else 0.0
+    )
+    result = {
+        "hidden_tokens": hidden_tokens,
+        "visible_tokens": max(0, usage["completion_tokens"] - usage["reasoning_tokens"])
+        or len(visible) // 4,
+        "ttft_s": ttft,
+        "visible_ttft_s": visible_ttft,
+        "think_delay_s": think_delay,
+        "total_s": end - start,
+    }
+    result["classification"] = classify_reasoning(result)
+    return result
+
+
+def classify_reasoning(probe: dict) -> str:
+    """Classify a probe result as "chat", "hybrid" or "reasoning"."""
+    if (
+        probe["hidden_tokens"] >= REASONING_TOKEN_THRESHOLD
+        or probe["think_delay_s"] >= REASONING_DELAY_THRESHOLD
+        or probe["visible_ttft_s"] is None  # Spent the whole budget thinking
+    ):
+        return "reasoning"
+    if probe["hidden_tokens"] > 0:
+        return "hybrid"
+    return "chat"
+
+
+def classify_candidates(
+    candidates: list[dict],
+    api_key: str,
+    ledger: UsageLedger = None,
+    limit: int = None,
+) -> dict:
+    """
+    Probe each candidate's reasoning behaviour, caching results per model version.
+    Stops once `limit` non-reasoning models are found or the budget runs out.
+    Falls back to the name heuristic if the probe fails.
+    """
+    cache_file = CACHE_DIR / "reasoning-probe.json"
+    try:
+        with open(cache_file) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    classifications = {}
+    dirty = False
+    for c in candidates:
+        if limit is not None and sum(
+            1 for p in classifications.values() if p["classification"] != "reasoning"
+        ) >= limit:
+            break
+        mid = c["id"]
+        key = f"{mid}@{c.get('version', '')}#v{PROBE_VERSION}"
+        if key in cache:
+            classifications[mid] = cache[key]
+            continue
+        print(f"    Probing {mid}...", end=" ", flush=True)
+        try:
+            with span("benchmark.probe", model=mid) as s:
+                probe = probe_reasoning(mid, api_key, ledger)
+                s.set(
+                    classification=probe["classification"],
+                    hidden_tokens=probe["hidden_tokens"],
+                    visible_ttft_s=probe["visible_ttft_s"],
+                )
+        except BudgetExceeded as e:
+            print(f"stopped\n  Budget reached: {e}")
+            break
+        except Exception as e:
+            guess = "reasoning" if (
+                is_reasoning_model(mid) or is_reasoning_model(c.get("name", ""))
+            ) else "chat"
+            print(f"probe failed ({str(e)[:60]}), guessing {guess} from name")
+            classifications[mid] = {"classification": guess, "probe_failed": True}
+            continue
+        visible_ttft = probe["visible_ttft_s"]
+        print(
+            f"{probe['classification']} ({probe['hidden_tokens']} hidden tokens, "
+            f"first visible token {'—' if visible_ttft is None else f'{visible_ttft:.1f}s'})"
+        )
+        classifications[mid] = cache[key] = probe
+        dirty = True
+
+    if dirty:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, "w") as f:
+                json.dump(cache, f, indent=2)
+        except OSError:
+            pass
+    return classifications
@@ -0,0 +1,93 @@
+"""Built-in benchmark prompt set and system prompt."""
+
+
+BENCHMARK_PROMPTS = [
+    # ── Factual (should answer correctly) ──
+    {
+        "id": "factual",
+        "prompt": "What is Quilibrium?",
+        "must_mention": ["decentralized", "privacy", "protocol"],
+        "must_not_mention": [],
+        "description": "Core protocol knowledge",
+    },
+    {
+        "id": "technical",
+        "prompt": "How does Quilibrium's consensus mechanism work?",
+        "must_mention": ["proof", "work"],
+        "must_not_mention": [],
+        "description": "Technical depth — must reference proof-of-meaningful-work",
+    },
+    {
+        "id": "product",
+        "prompt": "What is QKMS and how does it work?",
+        "must_mention": ["key", "management"],
+        "must_not_mention": [],
+        "description": "Product knowledge — key management service",
+    },
+    # ── Hallucination traps (should NOT make things up) ──
+    {
+        "id": "no-staking",
+        "prompt": "How do I stake QUIL tokens?",
+        "must_mention": [],
+        "must_not_mention": ["stake your tokens", "staking rewards", "apy", "validator staking",
+                             "delegate your", "staking pool", "earn rewards by staking"],
+        "description": "Quilibrium has NO staking — model must not hallucinate one",
+    },
+    {
+        "id": "no-solidity",
+        "prompt": "How do I deploy a Solidity smart contract on Quilibrium?",
+        "must_mention": [],
+        "must_not_mention": ["deploy your solidity", "compile your contract",
+                             "evm bytecode", "remix ide", "hardhat deploy"],
+        "description": "Quilibrium doesn't use Solidity/EVM — must not hallucinate",
+    },
+    {
+        "id": "no-price",
+        "prompt": "What will QUIL be worth in 2027?",
+        "must_mention": [],
+        "must_not_mention": ["will reach", "could reach", "projected to", "price target",
+                             "market cap of", "will be worth $"],
+        "description": "Should decline price speculation, not predict",
+    },
+    # ── Instruction following ──
+    {
+        "id": "concise",
+        "prompt": "In exactly one sentence, what does a Quilibrium node do?",
+        "must_mention": [],
+        "must_not_mention": [],
+        "max_sentences": 3,  # Generous, but penalizes essays
+        "description": "Instruction following — asked for one sentence",
+    },
+    # ── Boundary testing ──
+    {
+        "id": "off-topic",
+        "prompt": "What do you think of Solana?",
+        "must_mention": [],
+        "must_not_mention": [],
+        "should_decline": True,
+        "description": "Off-topic about another chain — should redirect to Quilibrium",
+    },
+    # ── Correction handling (multi-turn) ──
+    {
+        "id": "correction",
+        "prompt": "That's wrong. The node requirements are actually 16GB RAM minimum, not 8GB.",
+        "must_mention": [],
+        "must_not_mention": [],
+        "is_correction_test": True,
+        "description": "User says answer is wrong — model should acknowledge and offer to flag/fix, not double down",
+        # Requires multi-turn setup (assistant gave a previous answer)
+        "setup_messages": [
+            {"role": "user", "content": "What are the system requirements for running a Quilibrium node?"},
+            {"role": "assistant", "content": "To run a Quilibrium node, you'll need at least 8GB of RAM, a multi-core CPU, and around 250GB of disk space. Make sure your system meets these minimums for stable operation."},
+        ],
+    },
+]
+
+BENCHMARK_SYSTEM_PROMPT = (
+    "You are Quily, the official Quilibrium AI assistant. "
+    "You help users understand the Quilibrium decentralized protocol. "
+    "Be accurate, concise, and helpful. If you're not sure about something, say so. "
+    "Quilibrium uses proof-of-meaningful-work consensus and multi-party computation (MPC). "
+    "Quilibrium does NOT have staking, does NOT use EVM/Solidity, and is NOT an L1/L2 blockchain. "
+    "Only answer questions about Quilibrium. Politely decline off-topic questions."
+)
@@ -0,0 +1,494 @@
+"""
+Provider registry for model catalogs.
+
+Each catalog source implements fetch, parse-pricing and normalize-name; the
+registry fetches all enabled providers concurrently and merges their models
+through a cross-provider identity index (see build_identity_index). Any
+provider can be pointed at a local JSON file with --catalog-file NAME=PATH,
+and local OpenAI-compatible servers are added with --provider-url NAME=URL.
+"""
+
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .api import fetch_json, stream_sse_json
+from .catalog import fetch_chutes_models, fetch_openrouter_models
+from .models import extract_model_size
+
+
+# ─── Pricing parsers ────────────────────────────────────────────────────────
+
+def parse_or_pricing(model: dict) -> tuple[float, float]:
+    """Extract per-million-token pricing from OpenRouter model."""
+    pricing = model.get("pricing", {})
+    try:
+        p_in = float(pricing.get("prompt", 0)) * 1_000_000
+        p_out = float(pricing.get("completion", 0)) * 1_000_000
+    except (ValueError, TypeError):
+        p_in, p_out = 0.0, 0.0
+    return p_in, p_out
+
+
+def parse_or_cache_pricing(model: dict) -> float:
+    """Per-million-token price of cached prompt tokens on OpenRouter, or None if not offered."""
+    rate = model.get("pricing", {}).get("input_cache_read")
+    try:
+        return float(rate) * 1_000_000 if rate not in (None, "") else None
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_chutes_pricing(chute: dict) -> tuple[float, float]:
+    """Extract per-million-token pricing from Chutes model."""
+    price = chute.get("current_estimated_price", {})
+    per_m = price.get("per_million_tokens", {})
+    try:
+        p_in = per_m.get("input", {}).get("usd", 0.0)
+        p_out = per_m.get("output", {}).get("usd", 0.0)
+    except (ValueError, TypeError):
+        p_in, p_out = 0.0, 0.0
+    return p_in, p_out
+
+
+# ─── Model identity ─────────────────────────────────────────────────────────
+
+# Deployment details that don't change which model it is
+_IDENTITY_NOISE_RE = re.compile(
+    r"[-_.:](tee|fp8|fp16|bf16|int4|int8|awq|gptq|turbo|free|extended)\b"
+)
+_VERSION_P_RE = re.compile(r"(\d)p(\d)")  # Fireworks writes v3.1 as v3p1
+_SEPARATORS_RE = re.compile(r"[-_.\s]")
+_PARTS_RE = re.compile(r"[-_\s]+")
+# Name parts that describe a deployment: sizes (24b, a35b, 128e), dates, tuning
+_DETAIL_PART_RE = re.compile(r"\d+(\.\d+)?[bm]|a\d+(\.\d+)?b|\d+e|\d{4}|\d{6}|\d{8}|instruct|it|chat|hf")
+
+
+def model_identity(name: str) -> str:
+    """
+    Canonical cross-provider key for a model ID or name, e.g.
+    "deepseek/deepseek-v3.2", "deepseek-ai/DeepSeek-V3.2-TEE" and
+    "accounts/fireworks/models/deepseek-v3p2" all map to "deepseekv32".
+    """
+    s = name.lower().rsplit("/", 1)[-1]
+    s = _IDENTITY_NOISE_RE.sub("", s)
+    s = _VERSION_P_RE.sub(r"\1.\2", s)
+    s = _SEPARATORS_RE.sub("", s)
+    if s.startswith("meta") and "llama" in s:
+        s = s[len("meta"):]
+    return s
+
+
+def model_family(name: str) -> str:
+    """
+    model_identity() without the trailing parts that describe a deployment
+    rather than the model (parameter counts, date stamps, tuning tags), e.g.
+    "llama4maverick" for "meta-llama/Llama-4-Maverick-17B-128E-Instruct-FP8".
+    """
+    s = _VERSION_P_RE.sub(r"\1.\2", _IDENTITY_NOISE_RE.sub("", name.lower().rsplit("/", 1)[-1]))
+    parts = [p for p in _PARTS_RE.split(s) if p]
+    while len(parts) > 1 and _DETAIL_PART_RE.fullmatch(parts[-1]):
+        parts.pop()
+    return model_identity("-".join(parts))
+
+
+def _variant_order(identity: str, row: dict) -> tuple:
+    # Several variants of a family: prefer the largest model, then the shortest name
+    size = max(max(extract_model_size(e["id"]), extract_model_size(e["name"])) for e in row.values())
+    return (-size, len(identity))
+
+
+def find_identity(name: str, index: dict, families: dict) -> str:
+    """
+    Key of `name` in an identity index: its exact identity, else a listing of
+    the same family whose identity only adds or drops trailing deployment
+    details. `families` is family_index(index); returns None if nothing matches.
+
+    >>> chutes = ChutesProvider()
+    >>> index = build_identity_index({"chutes": [chutes.to_entry({"name": n}) for n in (
+    ...     "chutesai/Mistral-Small-3.2-24B-Instruct-2506", "Qwen/Qwen3-Coder-480B-A35B-Instruct-FP8",
+    ...     "meta-llama/Llama-4-Maverick-17B-128E-Instruct-FP8", "Qwen/Qwen3-32B")]})
+    >>> [find_identity(m, index, family_index(index)) for m in (
+    ...     "mistralai/mistral-small-3.2-24b-instruct", "qwen/qwen3-coder",
+    ...     "meta-llama/llama-4-maverick", "qwen/qwen3-14b")]
+    ['mistralsmall3224binstruct2506', 'qwen3coder480ba35binstruct', 'llama4maverick17b128einstruct', None]
+    """
+    identity = model_identity(name)
+    if identity in index:
+        return identity
+    matches = [
+        i for i in families.get(model_family(name), ())
+        if i.startswith(identity) or identity.startswith(i)
+    ]
+    return min(matches, key=lambda i: _variant_order(i, index[i])) if matches else None
+
+
+def family_index(index: dict) -> dict:
+    """{family: [identity, ...]} for an identity index (see find_identity)."""
+    families = {}
+    for identity, row in index.items():
+        family = next(iter(row.values()))["family"]
+        families.setdefault(family, []).append(identity)
+    return families
+
+
+# ─── Registry ───────────────────────────────────────────────────────────────
+
+PROVIDERS = {}
+
+
+def register_provider(cls):
+    """Class decorator: make a provider available by its `name`."""
+    PROVIDERS[cls.name] = cls
+    return cls
+
+
+class Provider:
+    """
+    Base catalog source. Subclasses set `name`, `models_url` and
+    `chat_url`, and override parse_response / parse_pricing as needed.
+    """
+
+    name = ""
+    label = ""
+    models_url = ""
+    chat_url = ""
+    api_key_env = None  # Env var holding the API key, if one is needed
+
+    def __init__(self, catalog_file: str = None, base_url: str = None):
+        self.catalog_file = catalog_file
+        if base_url:
+            base = base_url.rstrip("/")
+            self.models_url = f"{base}/models"
+            self.chat_url = f"{base}/chat/completions"
+
+    @property
+    def api_key(self) -> str:
+        return os.environ.get(self.api_key_env, "") if self.api_key_env else ""
+
+    def enabled(self) -> bool:
+        """Whether this provider can be queried (stand-in file, or credentials if required)."""
+        return bool(self.catalog_file) or not self.api_key_env or bool(self.api_key)
+
+    def _headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    def fetch_raw(self):
+        return fetch_json(self.models_url, headers=self._headers())
+
+    def fetch(self) -> list[dict]:
+        """Raw catalog entries, from the stand-in file if one is configured."""
+        if self.catalog_file:
+            with open(self.catalog_file) as f:
+                data = json.load(f)
+        else:
+            data = self.fetch_raw()
+        return self.parse_response(data)
+
+    def parse_response(self, data) -> list[dict]:
+        if isinstance(data, list):
+            return data
+        return data.get("data") or data.get("items") or []
+
+    def is_chat_model(self, raw: dict) -> bool:
+        return True
+
+    def model_id(self, raw: dict) -> str:
+        return raw.get("id", "")
+
+    def display_name(self, raw: dict) -> str:
+        return raw.get("name") or raw.get("display_name") or self.model_id(raw)
+
+    def chat_model_id(self, raw: dict) -> str:
+        """The `model` value this provider's chat endpoint expects."""
+        return self.model_id(raw)
+
+    def parse_pricing(self, raw: dict) -> tuple[float, float]:
+        """($/M input, $/M output), or (None, None) if the catalog has no pricing."""
+        return None, None
+
+    def identity_name(self, raw: dict) -> str:
+        """The name model_identity() and model_family() are derived from."""
+        return self.model_id(raw)
+
+    def normalize_name(self, raw: dict) -> str:
+        return model_identity(self.identity_name(raw))
+
+    def context_length(self, raw: dict) -> int:
+        return int(raw.get("context_length") or 0)
+
+    def to_entry(self, raw: dict) -> dict:
+        p_in, p_out = self.parse_pricing(raw)
+        return {
+            "provider": self.name,
+            "id": self.model_id(raw),
+            "chat_model": self.chat_model_id(raw),
+            "name": self.display_name(raw),
+            "identity": self.normalize_name(raw),
+            "family": model_family(self.identity_name(raw)),
+            "price_in": p_in,
+            "price_out": p_out,
+            "context_length": self.context_length(raw),
+        }
+
+    def measure_ttft(self, chat_model: str, timeout: int = 30) -> float:
+        """Seconds to the first streamed token for a one-line prompt."""
+        payload = {
+            "model": chat_model,
+            "messages": [{"role": "user", "content": "Reply with the single word: ok"}],
+            "max_tokens": 5,
+            "stream": True,
+        }
+        start = time.perf_counter()
+        stream = stream_sse_json(self.chat_url, payload, headers=self._headers(), timeout=timeout)
+        try:
+            for chunk in stream:
+                for choice in chunk.get("choices") or []:
+                    delta = choice.get("delta") or {}
+                    if delta.get("content") or delta.get("reasoning"):
+                        return time.perf_counter() - start
+        finally:
+            stream.close()
+        return None
+
+
+@register_provider
+class OpenRouterProvider(Provider):
+    name = "openrouter"
+    label = "OpenRouter"
+    models_url = "https://openrouter.ai/api/v1/models"
+    chat_url = "https://openrouter.ai/api/v1/chat/completions"
+    api_key_env = None  # Catalog is public; only latency pings need OPENROUTER_API_KEY
+
+    @property
+    def api_key(self) -> str:
+        return os.environ.get("OPENROUTER_API_KEY", "")
+
+    def fetch_raw(self):
+        return fetch_openrouter_models()
+
+    def is_chat_model(self, raw: dict) -> bool:
+        modality = (raw.get("architecture") or {}).get("modality", "")
+        mid = self.model_id(raw)
+        return "text" in modality.split("->")[-1] and not mid.endswith((":free", ":extended"))
+
+    def parse_pricing(self, raw: dict) -> tuple[float, float]:
+        return parse_or_pricing(raw)
+
+
+@register_provider
+class ChutesProvider(Provider):
+    name = "chutes"
+    label = "Chutes"
+    models_url = "https://api.chutes.ai/chutes/"
+    chat_url = "https://llm.chutes.ai/v1/chat/completions"
+    api_key_env = None  # Catalog is public; only latency pings need CHUTES_API_KEY
+
+    @property
+    def api_key(self) -> str:
+        return os.environ.get("CHUTES_API_KEY", "")
+
+    def fetch_raw(self):
+        return fetch_chutes_models()
+
+    def is_chat_model(self, raw: dict) -> bool:
+        return raw.get("standard_template") == "vllm"
+
+    def model_id(self, raw: dict) -> str:
+        return raw.get("slug", "")
+
+    def display_name(self, raw: dict) -> str:
+        return raw.get("name", "")
+
+    def chat_model_id(self, raw: dict) -> str:
+        return raw.get("name", "")  # The vLLM endpoint takes the HF-style name
+
+    def identity_name(self, raw: dict) -> str:
+        return raw.get("name") or self.model_id(raw)
+
+    def parse_pricing(self, raw: dict) -> tuple[float, float]:
+        return parse_chutes_pricing(raw)
+
+
+@register_provider
+class TogetherProvider(Provider):
+    name = "together"
+    label = "Together"
+    models_url = "https://api.together.xyz/v1/models"
+    chat_url = "https://api.together.xyz/v1/chat/completions"
+    api_key_env = "TOGETHER_API_KEY"
+
+    def is_chat_model(self, raw: dict) -> bool:
+        return raw.get("type", "chat") == "chat"
+
+    def parse_pricing(self, raw: dict) -> tuple[float, float]:
+        # Together already quotes $/M tokens
+        pricing = raw.get("pricing") or {}
+        try:
+            return float(pricing.get("input", 0)), float(pricing.get("output", 0))
+        except (ValueError, TypeError):
+            return None, None
+
+
+@register_provider
+class FireworksProvider(Provider):
+    name = "fireworks"
+    label = "Fireworks"
+    models_url = "https://api.fireworks.ai/inference/v1/models"
+    chat_url = "https://api.fireworks.ai/inference/v1/chat/completions"
+    api_key_env = "FIREWORKS_API_KEY"
+
+    def is_chat_model(self, raw: dict) -> bool:
+        return raw.get("supports_chat", True)
+
+    # The models endpoint carries no pricing — parse_pricing stays (None, None)
+
+
+class OpenAICompatibleProvider(Provider):
+    """A local or self-hosted OpenAI-compatible server (vLLM, llama.cpp, Ollama...)."""
+
+    label = "Local"
+
+    def __init__(self, name: str, base_url: str = None, catalog_file: str = None):
+        self.name = name
+        self.label = name
+        super().__init__(catalog_file=catalog_file, base_url=base_url)
+
+    def parse_pricing(self, raw: dict) -> tuple[float, float]:
+        return 0.0, 0.0  # Self-hosted: no per-token price
+
+
+def get_provider(name: str, catalog_files: dict = None, base_urls: dict = None) -> Provider:
+    """Instantiate a provider by name; unknown names with a base URL become OpenAI-compatible."""
+    catalog_files = catalog_files or {}
+    base_urls = base_urls or {}
+    if name in PROVIDERS:
+        return PROVIDERS[name](
+            catalog_file=catalog_files.get(name), base_url=base_urls.get(name)
+        )
+    if name in base_urls or name in catalog_files:
+        return OpenAICompatibleProvider(
+            name, base_url=base_urls.get(name), catalog_file=catalog_files.get(name)
+        )
+    raise KeyError(f"unknown provider {name!r} (known: {', '.join(PROVIDERS)})")
+
+
+# ─── Cross-provider discovery ───────────────────────────────────────────────
+
+def fetch_all(providers: list[Provider], workers: int = 4) -> dict:
+    """
+    Fetch every provider's catalog concurrently.
+    Returns {provider_name: [entry, ...]}; failed providers map to an error string.
+    """
+    def load(p: Provider):
+        return [p.to_entry(raw) for raw in p.fetch() if p.is_chat_model(raw)]
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(providers)))) as pool:
+        futures = {p.name: pool.submit(load, p) for p in providers}
+        for name, fut in futures.items():
+            try:
+                results[name] = fut.result()
+            except Exception as e:
+                results[name] = f"{type(e).__name__}: {str(e)[:100]}"
+    return results
+
+
+def build_identity_index(catalogs: dict) -> dict:
+    """Group entries by model identity: {identity: {provider_name: entry}}."""
+    index = {}
+    for provider_name, entries in catalogs.items():
+        if isinstance(entries, str):
+            continue  # Fetch failed
+        for entry in entries:
+            slot = index.setdefault(entry["identity"], {})
+            # Keep the cheapest listing if a provider has several variants
+            current = slot.get(provider_name)
+            if current is None or (entry["price_in"] or 0) < (current["price_in"] or 0):
+                slot[provider_name] = entry
+    return index
+
+
+def merge_identity_variants(index: dict) -> dict:
+    """
+    Fold rows that differ only in trailing deployment details (see
+    find_identity) into one, e.g. OpenRouter's "llama4maverick" and Chutes'
+    "llama4maverick17b128einstruct". A row is only folded into a shorter one
+    of its family when no provider lists both, so exact matches never move.
+    """
+    merged = dict(index)
+    for family, identities in family_index(index).items():
+        for target in sorted(identities, key=len):
+            if target not in merged:
+                continue
+            variants = sorted(
+                (i for i in identities if i != target and i in merged and i.startswith(target)),
+                key=lambda i: _variant_order(i, merged[i]),
+            )
+            for i in variants:
+                if not merged[target].keys() & merged[i].keys():
+                    merged[target] = {**merged[target], **merged.pop(i)}
+    return merged
+
+
+def measure_matrix_latency(providers: list[Provider], index: dict, identities: list[str]):
+    """Ping each listed model on each provider and store `ttft_s` on its entry."""
+    by_name = {p.name: p for p in providers}
+    jobs = [
+        (by_name[pname], entry)
+        for identity in identities
+        for pname, entry in index[identity].items()
+        if by_name[pname].api_key or isinstance(by_name[pname], OpenAICompatibleProvider)
+    ]
+
+    def ping(job):
+        provider, entry = job
+        try:
+            entry["ttft_s"] = provider.measure_ttft(entry["chat_model"])
+        except Exception as e:
+            entry["ttft_error"] = str(e)[:80]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(ping, jobs))
+
+
+def print_matrix(providers: list[Provider], catalogs: dict, index: dict, identities: list[str]):
+    """Print the price/latency matrix: one row per model, one column per provider."""
+    names = [p.name for p in providers]
+    col = 22
+    print()
+    print("=" * 110)
+    print("  CROSS-PROVIDER MATRIX — $/M in / $/M out [TTFT]")
+    print("=" * 110)
+    for p in providers:
+        entries = catalogs.get(p.name)
+        status = entries if isinstance(entries, str) else f"{len(entries)} chat models"
+        print(f"  {p.label or p.name:<12} {status}")
+    print("  " + "-" * 106)
+    print(f"  {'Model':<34}" + "".join(f"{n[:col - 1]:>{col}}" for n in names))
+    print("  " + "-" * 106)
+    for identity in identities:
+        row = index[identity]
+        first = next(iter(row.values()))
+        priced = [e for e in row.values() if e["price_in"] is not None]
+        cheapest = min(priced, key=lambda e: (e["price_in"], e["price_out"]))["provider"] if priced else None
+        cells = []
+        for n in names:
+            e = row.get(n)
+            if not e:
+                cells.append(f"{'—':>{col}}")
+                continue
+            price = (
+                f"{e['price_in']:.2f}/{e['price_out']:.2f}" if e["price_in"] is not None else "n/a"
+            )
+            if e.get("ttft_s") is not None:
+                price += f" [{e['ttft_s']:.2f}s]"
+            if n == cheapest and len(priced) > 1:
+                price = "*" + price
+            cells.append(f"{price:>{col}}")
+        print(f"  {first['name'][:33]:<34}" + "".join(cells))
+    print("  " + "-" * 106)
+    print("  * = cheapest listing; n/a = provider catalog has no pricing; TTFT with --matrix-latency")
+    print("=" * 110)
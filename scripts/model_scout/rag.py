@@ -0,0 +1,455 @@
+"""
+RAG-in-the-loop benchmark.
+
+Production answers are generated with retrieved docs in the system prompt,
+so long-prompt prefill speed and long-context accuracy matter more than the
+bare-prompt benchmark shows. This mode builds production-shaped prompts
+(a condensed src/lib/rag/prompt.ts) from a frozen snapshot of retrieved
+chunks, fills them to each target context size (4k/16k/64k by default) and
+records answer quality, time-to-first-token and whether the provider really
+accepts the advertised `context_length`.
+
+The snapshot is JSON in the RetrievedChunk shape of src/lib/rag/types.ts,
+keyed by test ID, so a dump from the real retriever can be dropped in. When
+no snapshot exists one is frozen from the local docs/ tree with keyword
+(BM25) retrieval — no Supabase or embedding calls needed.
+"""
+
+import json
+import math
+import re
+import statistics
+import time
+import urllib.error
+from collections import Counter
+from pathlib import Path
+
+from .config import CACHE_DIR, PROJECT_ROOT
+from .instrument import span
+from .usage import BudgetExceeded, UsageLedger, estimate_tokens
+
+DOCS_DIR = PROJECT_ROOT / "docs"
+DEFAULT_SNAPSHOT = CACHE_DIR / "rag-snapshot.json"
+SNAPSHOT_VERSION = 1
+CHUNK_CHARS = 3200  # ~800 tokens, the target size in scripts/ingest/chunker.ts
+CHUNKS_PER_QUERY = 100  # Enough ranked chunks to fill a 64k prompt
+RAG_MAX_TOKENS = 800
+# Prompts are sized with the ~4 chars/token estimate; real tokenizers can run
+# denser, so fill at most this share of the advertised window
+CONTEXT_MARGIN = 0.9
+UNCALIBRATED_TOKEN_RATIO = 1.3  # Assumed real/estimated prompt tokens until a call reports usage
+
+_FRONTMATTER_RE = re.compile(r"^---\r?\n(.*?)\r?\n---\r?\n", re.DOTALL)
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_CITATION_RE = re.compile(r"\[(\d{1,3})\]")
+_CONTEXT_ERROR_RE = re.compile(r"context|too long|maximum.*tokens|token limit", re.IGNORECASE)
+
+RAG_SYSTEM_PROMPT = """# Quily Assistant
+
+You are Quily, the official Quilibrium AI assistant: dry ironic humor, crypto-veteran, casual but not sycophantic.
+
+## Knowledge Scope
+
+Your knowledge is LIMITED to the documentation context below.
+QConsole services (Q Storage, QKMS, ...) are managed services ON TOP of the network, not the protocol itself.
+
+## Response Rules
+
+1. Answer ONLY from the documentation context below. If not covered, say so and point to docs.quilibrium.com.
+2. Cite sources inline as [1] through [{max_citation}].
+3. Max 1800 characters. Short bullet points over paragraphs.
+4. Only include CLI commands explicitly shown in the docs. Never modify or invent commands.
+5. Never expand acronyms or extrapolate technical details the docs don't state.
+
+## Documentation Context
+
+{context}"""
+
+
+# ─── Snapshot ───────────────────────────────────────────────────────────────
+
+def _parse_frontmatter(text: str) -> tuple[dict, str]:
+    m = _FRONTMATTER_RE.match(text)
+    if not m:
+        return {}, text
+    meta = {}
+    for line in m.group(1).splitlines():
+        key, sep, value = line.partition(":")
+        if sep and not line.startswith((" ", "-")):
+            meta[key.strip()] = value.strip().strip("'\"")
+    return meta, text[m.end():]
+
+
+def _chunk_document(rel_path: str, meta: dict, body: str) -> list[dict]:
+    """Split a markdown doc into ~CHUNK_CHARS chunks along paragraph boundaries."""
+    chunks = []
+    headings = []
+    buf, buf_heading = [], None
+
+    def flush():
+        content = "\n\n".join(buf).strip()
+        if len(content) > 80:
+            chunks.append({
+                "content": content,
+                "source_file": rel_path,
+                "heading_path": buf_heading,
+                "source_url": meta.get("source_url") or meta.get("youtube_url"),
+                "published_date": meta.get("date"),
+                "title": meta.get("title"),
+                "doc_type": meta.get("type"),
+            })
+        buf.clear()
+
+    for para in re.split(r"\n\s*\n", body):
+        first = para.strip().splitlines()[0] if para.strip() else ""
+        h = _HEADING_RE.match(first)
+        if h:
+            level = len(h.group(1))
+            headings[level - 1:] = [h.group(2)]
+        if buf and sum(len(p) for p in buf) + len(para) > CHUNK_CHARS:
+            flush()
+        if not buf:
+            buf_heading = " > ".join(headings) or None
+        buf.append(para.strip())
+    flush()
+    return chunks
+
+
+def _load_doc_chunks(docs_dir: Path) -> list[dict]:
+    chunks = []
+    for path in sorted(docs_dir.rglob("*.md")):
+        try:
+            meta, body = _parse_frontmatter(path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            continue
+        chunks.extend(_chunk_document(path.relative_to(docs_dir).as_posix(), meta, body))
+    return chunks
+
+
+def _retrieve(chunks: list[dict], doc_terms: list[Counter], df: Counter, query: str, k: int) -> list[dict]:
+    """Rank chunks for a query with BM25 and return the top k with a 0-1 similarity."""
+    n = len(chunks)
+    avg_len = sum(sum(t.values()) for t in doc_terms) / max(n, 1)
+    q_terms = set(_WORD_RE.findall(query.lower()))
+    scores = []
+    for i, terms in enumerate(doc_terms):
+        length = sum(terms.values())
+        s = 0.0
+        for t in q_terms:
+            tf = terms.get(t)
+            if tf:
+                idf = math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5))
+                s += idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * length / avg_len))
+        if s > 0:
+            scores.append((s, i))
+    scores.sort(reverse=True)
+    top = scores[0][0] if scores else 1.0
+    return [{**chunks[i], "similarity": round(s / top, 3)} for s, i in scores[:k]]
+
+
+def build_snapshot(prompts: list[dict], docs_dir: Path = DOCS_DIR, per_query: int = CHUNKS_PER_QUERY) -> dict:
+    """Freeze the top-ranked doc chunks for each prompt."""
+    chunks = _load_doc_chunks(docs_dir)
+    doc_terms = [Counter(_WORD_RE.findall(c["content"].lower())) for c in chunks]
+    df = Counter(t for terms in doc_terms for t in terms)
+    return {
+        "version": SNAPSHOT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "retriever": f"bm25 over {docs_dir.name}/ ({len(chunks)} chunks)",
+        "queries": {
+            t["id"]: _retrieve(chunks, doc_terms, df, t["prompt"], per_query) for t in prompts
+        },
+    }
+
+
+def load_rag_snapshot(prompts: list[dict], path: Path = DEFAULT_SNAPSHOT) -> dict:
+    """
+    Load the frozen snapshot; prompts it doesn't cover yet are retrieved from
+    docs/ once and added, so existing entries never change between runs.
+    """
+    try:
+        with open(path) as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        snapshot = {"version": SNAPSHOT_VERSION, "queries": {}}
+
+    missing = [t for t in prompts if t["id"] not in snapshot["queries"]]
+    if missing:
+        print(f"  Freezing retrieval for {len(missing)} prompt(s) from {DOCS_DIR.name}/ into {path}")
+        fresh = build_snapshot(missing)
+        snapshot["queries"].update(fresh["queries"])
+        snapshot.setdefault("retriever", fresh["retriever"])
+        snapshot.setdefault("created_at", fresh["created_at"])
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(snapshot, f)
+        except OSError:
+            pass
+    return snapshot
+
+
+# ─── Prompt building ────────────────────────────────────────────────────────
+
+def format_context(chunks: list[dict]) -> str:
+    """Condensed port of buildContextBlock() in src/lib/rag/prompt.ts."""
+    blocks = []
+    for i, chunk in enumerate(chunks, 1):
+        is_livestream = chunk.get("doc_type") == "livestream_transcript"
+        title = "Livestream" if is_livestream else (
+            chunk.get("title") or chunk.get("heading_path") or chunk.get("source_file", "")
+        )
+        meta = [m for m in (
+            None if is_livestream or not chunk.get("doc_type")
+            else chunk["doc_type"].replace("_", " ").title(),
+            "Unofficial" if chunk.get("source_file", "").startswith("community/") else None,
+            chunk.get("published_date"),
+        ) if m]
+        annotation = f" ({', '.join(meta)})" if meta else ""
+        source = (
+            f"Source: [{title}]({chunk['source_url']}){annotation}" if chunk.get("source_url")
+            else f"Source: {title}{annotation}"
+        )
+        blocks.append(f"[{i}] {source}\n---\n{chunk['content']}")
+    return "\n\n".join(blocks)
+
+
+def build_rag_messages(
+    test: dict,
+    ranked: list[dict],
+    filler: list[dict],
+    target_tokens: int,
+    max_tokens: int = RAG_MAX_TOKENS,
+) -> tuple[list[dict], int]:
+    """
+    Build production-shaped messages filled to about `target_tokens`.
+    Retrieved chunks come first in rank order; `filler` (other queries' chunks)
+    pads long targets, as low-relevance retrieval does in production.
+    Returns (messages, chunk_count).
+    """
+    tail = list(test.get("setup_messages", [])) + [{"role": "user", "content": test["prompt"]}]
+    overhead = estimate_tokens(
+        [{"role": "system", "content": RAG_SYSTEM_PROMPT}] + tail
+    )
+    room = target_tokens - max_tokens - overhead
+    chosen, seen = [], set()
+    for chunk in ranked + filler:
+        key = (chunk.get("source_file"), chunk["content"][:64])
+        if key in seen:
+            continue
+        cost = len(chunk["content"]) // 4 + 20  # Content plus the source line
+        if cost > room:
+            if chosen:
+                break
+            continue
+        seen.add(key)
+        chosen.append(chunk)
+        room -= cost
+    system = RAG_SYSTEM_PROMPT.format(max_citation=len(chosen), context=format_context(chosen))
+    return [{"role": "system", "content": system}] + tail, len(chosen)
+
+
+# ─── Benchmark ──────────────────────────────────────────────────────────────
+
+def _context_status(advertised: int, needed: int, errors: list[str], ok: int) -> str:
+    """`needed` = the largest rejected request's prompt (in real tokens, estimated) plus answer room."""
+    if not advertised:
+        return "unknown" if not ok else "ok"
+    if ok:
+        return "ok"
+    if any(_CONTEXT_ERROR_RE.search(e) for e in errors):
+        # Only a request that really fit the window counts against the advertised length
+        return "REJECTED within advertised" if needed <= advertised else "rejected near limit"
+    return "error"
+
+
+def run_rag_benchmark(
+    candidates: list[dict],
+    prompts: list[dict],
+    sizes: list[tuple[str, int]],
+    snapshot_path: Path = DEFAULT_SNAPSHOT,
+    max_models: int = 3,
+    ledger: UsageLedger = None,
+) -> dict:
+    """
+    Benchmark each model at each context size with retrieval-filled prompts.
+    Calls run sequentially so TTFT reflects prefill, not self-inflicted queueing.
+    """
+    import os
+
+    from .benchmark import stream_completion
+    from .models import extract_model_size
+    from .probe import classify_candidates
+    from .scoring import score_response
+
+    api_key = os.environ.get("OPENROUTER_API_KEY", "")
+    if not api_key:
+        print("\n  WARNING: OPENROUTER_API_KEY not set. Skipping RAG benchmark.")
+        return {}
+
+    snapshot = load_rag_snapshot(prompts, snapshot_path)
+    queries = snapshot["queries"]
+    print(f"  Snapshot: {snapshot.get('retriever', 'retrieved chunks')}, "
+          f"frozen {snapshot.get('created_at', '?')}")
+
+    ranked_models = sorted(candidates, key=lambda c: -extract_model_size(c["name"]))
+    if ledger:
+        for c in ranked_models:
+            ledger.set_pricing(c)
+    probes = classify_candidates(ranked_models, api_key, ledger, limit=max_models)
+    models = [c for c in ranked_models if probes.get(c["id"], {}).get("classification") in ("chat", "hybrid")]
+
+    results = {}
+    stopped = False
+    for c in models[:max_models]:
+        mid = c["id"]
+        advertised = int(c.get("context_length") or 0)
+        print(f"\n  {mid} (advertised context {advertised // 1000 if advertised else '?'}k)")
+        per_size = {}
+        token_ratios = []  # Reported / estimated prompt tokens, to judge rejections
+        for label, target in sizes:
+            runs, errors, rejected_est = [], [], []
+            if advertised and target > advertised:
+                print(f"    {label:>5}: skipped — beyond advertised context")
+                per_size[label] = {"target_tokens": target, "status": "beyond advertised", "runs": []}
+                continue
+            fill = min(target, int(advertised * CONTEXT_MARGIN)) if advertised else target
+            for test in prompts:
+                filler = [ch for tid, chunks in queries.items() if tid != test["id"] for ch in chunks]
+                messages, n_chunks = build_rag_messages(test, queries.get(test["id"], []), filler, fill)
+                est = estimate_tokens(messages)
+                try:
+                    if ledger:
+                        ledger.check(mid, messages, RAG_MAX_TOKENS)
+                    with span("benchmark.rag", model=mid, size=label, test=test["id"]) as s:
+                        completion = stream_completion(mid, api_key, messages, max_tokens=RAG_MAX_TOKENS)
+                        s.set(ttft_s=completion["ttft_s"], prompt_tokens=completion["usage"]["prompt_tokens"])
+                except BudgetExceeded as e:
+                    print(f"    Budget reached: {e}")
+                    stopped = True
+                    break
+                except Exception as e:
+                    detail = str(e)
+                    if isinstance(e, urllib.error.HTTPError):
+                        try:  # The reason is in the body, e.g. "maximum context length is ..."
+                            detail += ": " + e.read().decode("utf-8", errors="replace")
+                        except OSError:
+                            pass
+                    errors.append(detail[:200])
+                    rejected_est.append(est)
+                    continue
+                if ledger:
+                    ledger.record(mid, f"rag-{label}", completion["usage"])
+                if not completion["usage_estimated"] and est:
+                    token_ratios.append(completion["usage"]["prompt_tokens"] / est)
+                scored = score_response(test, completion["content"])
+                cites = {int(n) for n in _CITATION_RE.findall(completion["content"])}
+                runs.append({
+                    "test": test["id"],
+                    "score": scored["score"],
+                    "cited": bool(cites) and max(cites) <= n_chunks,
+                    "chunks": n_chunks,
+                    "prompt_tokens": completion["usage"]["prompt_tokens"],
+                    "ttft_s": completion["ttft_s"],
+                    "latency_s": completion["latency_s"],
+                })
+            ttfts = [r["ttft_s"] for r in runs if r["ttft_s"] is not None]
+            ratio = max(token_ratios) if token_ratios else UNCALIBRATED_TOKEN_RATIO
+            needed = int(max(rejected_est, default=0) * ratio) + RAG_MAX_TOKENS
+            summary = {
+                "target_tokens": target,
+                "fill_tokens": fill,
+                "status": _context_status(advertised, needed, errors, len(runs)),
+                "ok": len(runs),
+                "errors": errors[:3],
+                "score": round(statistics.mean(r["score"] for r in runs), 2) if runs else None,
+                "cited_rate": round(sum(r["cited"] for r in runs) / len(runs), 2) if runs else None,
+                "prompt_tokens": round(statistics.mean(r["prompt_tokens"] for r in runs)) if runs else None,
+                "ttft_p50_s": round(statistics.median(ttfts), 3) if ttfts else None,
+                "runs": runs,
+            }
+            per_size[label] = summary
+            if stopped and not runs and not errors:
+                del per_size[label]  # Nothing measured at this size
+            elif runs:
+                print(f"    {label:>5}: score {summary['score']:.2f}/3, cited {summary['cited_rate']:.0%}, "
+                      f"~{summary['prompt_tokens']:,} prompt tok, TTFT p50 "
+                      + (f"{summary['ttft_p50_s']:.2f}s" if ttfts else "—")
+                      + (f", {len(errors)} failed" if errors else ""))
+            else:
+                print(f"    {label:>5}: all {len(errors)} calls failed ({summary['status']}): {errors[0][:80]}")
+            if stopped:
+                break
+
+        if per_size:
+            results[mid] = {
+                "advertised_context": advertised,
+                "sizes": per_size,
+                "prefill_tok_per_s": _prefill_rate(per_size),
+            }
+        if stopped:
+            break  # Keep what was measured; later models would hit the budget too
+    return results
+
+
+def _prefill_rate(per_size: dict) -> float:
+    """Marginal prefill speed from the TTFT slope between the smallest and largest sizes."""
+    points = [
+        (s["prompt_tokens"], s["ttft_p50_s"]) for s in per_size.values()
+        if s.get("prompt_tokens") and s.get("ttft_p50_s") is not None
+    ]
+    if len(points) < 2:
+        return None
+    (t0, l0), (t1, l1) = min(points), max(points)
+    if t1 <= t0 or l1 <= l0:
+        return None
+    return round((t1 - t0) / (l1 - l0))
+
+
+def print_rag_report(results: dict):
+    """Print quality and prefill latency by context size, plus the context-length check."""
+    if not results:
+        return
+    labels = []
+    for r in results.values():
+        for label in r["sizes"]:
+            if label not in labels:
+                labels.append(label)
+    print()
+    print("=" * 110)
+    print("  RAG BENCHMARK — score (0-3) / TTFT p50 by context size")
+    print("=" * 110)
+    print(f"  {'Model':<40} {'Adv. ctx':>8}" + "".join(f"{l:>16}" for l in labels) + f" {'Prefill':>11}")
+    print("  " + "-" * 106)
+    flagged, failed = [], 0
+    for mid, r in results.items():
+        cells = []
+        for label in labels:
+            s = r["sizes"].get(label)
+            if not s or s["status"] == "beyond advertised":
+                cells.append(f"{'—':>16}")
+            elif not s.get("ok"):
+                rejected = s["status"].startswith("REJECTED")
+                near = s["status"] == "rejected near limit"
+                cells.append(f"{'rejected' if rejected else 'near limit' if near else 'failed':>16}")
+                failed += not (rejected or near)
+            else:
+                ttft = f"{s['ttft_p50_s']:.2f}s" if s["ttft_p50_s"] is not None else "—"
+                cells.append(f"{s['score']:>9.2f} {ttft:>6}")
+            if s and s["status"].startswith("REJECTED"):
+                flagged.append((mid, label, r["advertised_context"]))
+        adv = f"{r['advertised_context'] // 1000}k" if r["advertised_context"] else "?"
+        prefill = f"{r['prefill_tok_per_s']:,} t/s" if r["prefill_tok_per_s"] else "—"
+        print(f"  {mid[:39]:<40} {adv:>8}" + "".join(cells) + f" {prefill:>11}")
+    print("  " + "-" * 106)
+    for mid, label, adv in flagged:
+        print(f"  ! {mid}: {label} prompt rejected although {adv // 1000}k context is advertised")
+    if not flagged and not failed:
+        print("  Context lengths: every tested size within the advertised window was accepted")
+    if failed:
+        print("  Some sizes failed for reasons other than context length — see errors in --format json")
+    print(f"  Prompts fill at most {CONTEXT_MARGIN:.0%} of the advertised window; "
+          "'near limit' = rejected, but the real prompt may not have fit")
+    print("  Prefill = marginal prompt tokens/s from the TTFT slope between the smallest and largest size")
+    print("=" * 110)
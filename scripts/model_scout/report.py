@@ -0,0 +1,218 @@
+"""Phase 3: console report."""
+
+from datetime import datetime
+
+from .catalog import fetch_chutes_models
+from .curated import get_current_models
+from .models import extract_model_size
+from .providers import parse_chutes_pricing
+
+
+def print_report(
+    on_chutes: list[dict],
+    not_on_chutes: list[dict],
+    model_type: str,
+    benchmark_results: dict = None,
+):
+    """Print the model scout report."""
+    current = get_current_models(model_type)
+    current_or_ids = {
+        v["openrouter_id"] for v in current.values() if v.get("openrouter_id")
+    }
+    current_chutes_slugs = set(current.keys())
+
+    type_label = "LLM" if model_type == "llm" else "Embedding"
+    print()
+    print("=" * 110)
+    print(f"  MODEL SCOUT REPORT — {type_label} Models")
+    print(f"  Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    print("=" * 110)
+
+    # ── Current models ──
+    print(f"\n  CURRENT {type_label.upper()} MODELS")
+    print("  " + "-" * 106)
+    print(f"  {'Model':<35} {'Role':<12} {'Chutes Slug':<50}")
+    print("  " + "-" * 106)
+    for slug, info in current.items():
+        print(f"  {info['display']:<35} {info['role']:<12} {slug}")
+
+    # ── Candidates on Chutes (most actionable) ──
+    if not on_chutes:
+        print(f"\n  No new open-source {type_label} candidates found on Chutes.")
+    else:
+        # Get primary model pricing for comparison
+        primary_slug = next(
+            (s for s, v in current.items() if v["role"] == "primary"), None
+        )
+        primary_chutes = next(
+            (c for c in on_chutes if primary_slug and primary_slug in c.get("chutes_slug", "")),
+            None,
+        )
+        # If primary wasn't in the OpenRouter results (already in use), fetch its Chutes price
+        if not primary_chutes and primary_slug:
+            try:
+                chutes_all = fetch_chutes_models()
+                for ch in chutes_all:
+                    if primary_slug in ch.get("slug", ""):
+                        cp_in, cp_out = parse_chutes_pricing(ch)
+                        primary_chutes = {
+                            "chutes_price_in": cp_in,
+                            "chutes_price_out": cp_out,
+                            "chutes_invocations": ch.get("invocation_count", 0),
+                        }
+                        break
+            except Exception:
+                pass
+
+        # Filter out models we already use
+        new_candidates = [
+            c for c in on_chutes
+            if c["id"] not in current_or_ids
+            and c.get("chutes_slug", "") not in current_chutes_slugs
+        ]
+
+        if not new_candidates:
+            print(f"\n  All Chutes-available candidates are already in use.")
+        else:
+            # ── CHUTES SECTION: sorted by power (subscription — cost doesn't filter) ──
+            # Quality rank: model size > invocations > context window
+            for c in new_candidates:
+                c["_size"] = extract_model_size(c["name"])
+
+            new_candidates.sort(key=lambda c: (
+                -c["_size"],                          # Bigger model first
+                -c.get("chutes_invocations", 0),      # More popular first
+                -c.get("context_length", 0),           # Larger context first
+            ))
+
+            # Price comparison tag vs primary
+            ref_in = primary_chutes.get("chutes_price_in", 0) if primary_chutes else 0
+
+            print(f"\n  CHUTES CANDIDATES — ranked by estimated capability ({len(new_candidates)} found)")
+            print("  Chutes uses subscription pricing — cost shown for reference, not as a filter.")
+            if primary_chutes:
+                ref_inv = primary_chutes.get("chutes_invocations", 0)
+                print(f"  Current primary: {primary_slug} (${ref_in:.3f}/M in, {ref_inv:,} invocations)")
+            print("  " + "-" * 106)
+            header = (
+                f"  {'Model':<35} {'Size':>6} {'Ctx':>6} "
+                f"{'Chutes In':>10} {'Chutes Out':>11} "
+                f"{'TEE':>4} {'Invocations':>12}  {'vs Primary'}"
+            )
+            print(header)
+            print("  " + "-" * 106)
+
+            for c in new_candidates:
+                # Price comparison tag
+                c_in = c.get("chutes_price_in", 0)
+                if ref_in > 0:
+                    if c_in < ref_in * 0.8:
+                        price_tag = "CHEAPER"
+                    elif c_in > ref_in * 1.2:
+                        price_tag = "PRICIER"
+                    else:
+                        price_tag = "SIMILAR COST"
+                else:
+                    price_tag = ""
+
+                tee = "Yes" if c.get("chutes_tee") else "No"
+                invocations = c.get("chutes_invocations", 0)
+                inv_str = f"{invocations:,}" if invocations else "—"
+                size = c.get("_size", 0)
+                size_str = f"{size:.0f}B" if size >= 1 else (f"{size}B" if size > 0 else "—")
+                ctx = c.get("context_length", 0)
+                ctx_str = f"{ctx // 1000}k" if ctx > 0 else "—"
+
+                bench_str = ""
+                if benchmark_results and c["id"] in benchmark_results:
+                    br = benchmark_results[c["id"]]
+                    if br.get("ci_low") is not None:
+                        half = (br["ci_high"] - br["ci_low"]) / 2
+                        bench_str = (
+                            f" [Bench: {br['score']}/{br['max']} ±{half:.1f}, n={br['samples']}]"
+                        )
+                    else:
+                        bench_str = f" [Bench: {br['score']}/{br['max']}]"
+                    if br.get("errors"):
+                        bench_str += f" [{br['errors']} failed calls]"
+                    if br.get("judge_score") is not None:
+                        bench_str += f" [Judge: {br['judge_score']:.2f}]"
+
+                print(
+                    f"  {c['name']:<35} {size_str:>6} {ctx_str:>6} "
+                    f"${c.get('chutes_price_in', 0):>8.3f} ${c.get('chutes_price_out', 0):>9.3f} "
+                    f"{tee:>4} {inv_str:>12}  {price_tag}"
+                    f"{bench_str}"
+                )
+
+    # ── OpenRouter-only candidates (for reference / pay-as-you-go) ──
+    notable_or_only = [
+        c for c in not_on_chutes
+        if c["id"] not in current_or_ids
+        and c["price_in"] < 0.50
+    ]
+    if notable_or_only:
+        print(f"\n  OPENROUTER-ONLY — not on Chutes, relevant if using pay-as-you-go ({len(notable_or_only)} shown)")
+        print("  " + "-" * 106)
+        print(
+            f"  {'Model':<45} {'Context':>8} "
+            f"{'$/M In':>10} {'$/M Out':>11}"
+        )
+        print("  " + "-" * 106)
+        for c in notable_or_only[:15]:
+            print(
+                f"  {c['name']:<45} {c['context_length'] // 1000:>6}k "
+                f"${c['price_in']:>8.3f} ${c['price_out']:>9.3f}"
+            )
+        if len(notable_or_only) > 15:
+            print(f"  ... and {len(notable_or_only) - 15} more")
+
+    print()
+    print("=" * 110)
+    print("  Notes:")
+    print("  - Chutes section: sorted by model size/capability, not price (subscription model)")
+    print("  - Price shown for reference — relevant if switching to pay-as-you-go")
+    print("  - Size = total parameters (MoE models show total, e.g. 235B-A22B = 235B total)")
+    print("  - Context = max token window in thousands (k)")
+    print("  - TEE = Trusted Execution Environment (privacy-preserving)")
+    print("  - Invocations = total API calls on Chutes (popularity/trust signal)")
+    if benchmark_results:
+        print("  - Bench scores: higher is better (tests Q&A quality with Quilibrium questions)")
+        print("  - With --samples > 1, bench shows mean score ± 95% CI half-width over n passes")
+        if any(br.get("judge_score") is not None for br in benchmark_results.values()):
+            print("  - Judge = mean LLM-judge grade (0-1) of the last pass's answers")
+    print("  - To update the curated list, edit src/lib/chutes/chuteDiscovery.ts")
+    print("=" * 110)
+
+
+def build_json_report(
+    on_chutes: list[dict],
+    not_on_chutes: list[dict],
+    model_type: str,
+    benchmark_results: dict = None,
+    ledger=None,
+    extra: dict = None,
+) -> dict:
+    """Machine-readable version of the report (for --format json)."""
+    def public(c: dict) -> dict:
+        return {k: v for k, v in c.items() if not k.startswith("_")}
+
+    report = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "model_type": model_type,
+        "current": get_current_models(model_type),
+        "on_chutes": [public(c) for c in on_chutes],
+        "openrouter_only": [public(c) for c in not_on_chutes],
+        "benchmark": benchmark_results or {},
+    }
+    for section, results in (extra or {}).items():
+        if results:
+            report[section] = results
+    if ledger and ledger.calls:
+        report["usage"] = {
+            "total_tokens": ledger.total_tokens,
+            "total_cost_usd": ledger.total_cost,
+            "by_model": ledger.by_model(),
+            "by_test": ledger.by_test(),
+        }
+    return report
@@ -0,0 +1,195 @@
+"""Keyword scoring of benchmark answers, incl. early-abort checks for streams."""
+
+import re
+
+_THINK_RE = re.compile(r'<think>.*?</think>', re.DOTALL)
+
+
+def strip_thinking(raw_content: str) -> str:
+    """Answer text with <think>...</think> blocks stripped, case preserved."""
+    content = _THINK_RE.sub('', raw_content).strip()
+    # If stripping left nothing, fall back to the raw content
+    if len(content.split()) < 3:
+        content = raw_content
+    return content
+
+
+def visible_content(raw_content: str) -> str:
+    """Lowercased answer text for keyword matching (see strip_thinking)."""
+    return strip_thinking(raw_content).lower().replace("\u2019", "'")
+
+
+# Negations written either way round in answers and in test concepts
+_CONTRACTIONS = {"can't": "cannot", "don't": "do not", "doesn't": "does not", "won't": "will not"}
+
+
+def concept_variants(concept: str) -> set[str]:
+    """
+    Surface forms a keyword check accepts for one concept: hyphens as spaces
+    or dropped ("peer to peer"), the initials of a 3+ part hyphenated term
+    ("pomw", "p2p"), and negations contracted or not ("can't" / "cannot").
+    """
+    c = concept.lower().replace("\u2019", "'")
+    forms = {c}
+    if "-" in c:
+        parts = c.split("-")
+        forms |= {" ".join(parts), "".join(parts)}
+        if len(parts) >= 3:
+            forms.add("".join("2" if p == "to" else p[0] for p in parts))
+    for short, long in _CONTRACTIONS.items():
+        forms |= {f.replace(short, long) for f in forms} | {f.replace(long, short) for f in forms}
+    return forms
+
+
+def mentions(content: str, concept) -> bool:
+    """Whether lowercased `content` mentions `concept` (a list means any of its phrasings)."""
+    alternatives = [concept] if isinstance(concept, str) else concept
+    return any(form in content for alt in alternatives for form in concept_variants(alt))
+
+
+# Correction test: phrases that mean the model insisted on its wrong answer
+DOUBLED_DOWN_PHRASES = [
+    "actually 8gb", "8gb is correct", "the requirement is 8gb",
+    "8 gb is the minimum",
+]
+
+# Characters of new output between early-abort checks while streaming
+ABORT_CHECK_CHARS = 32
+
+
+def early_abort_reason(test: dict, raw_content: str) -> str:
+    """
+    Return why a streaming answer can be cut short, or None to keep reading.
+
+    Only fires when the rest of the answer can no longer change the score:
+    a hallucination, a doubled-down correction or an exceeded sentence limit,
+    each only on prompts with no other check that later text could still pass
+    or fail.
+    """
+    # Ignore an unfinished <think> block — only the visible answer is scored
+    open_think = raw_content.rfind("<think>")
+    if open_think != -1 and raw_content.find("</think>", open_think) == -1:
+        raw_content = raw_content[:open_think]
+    content = _THINK_RE.sub('', raw_content).lower()
+
+    checks = {
+        key for key in ("must_mention", "must_not_mention", "should_decline", "is_correction_test")
+        if test.get(key)
+    }
+    if test.get("max_sentences") is not None:
+        checks.add("max_sentences")
+
+    if checks == {"must_not_mention"}:
+        hallucinated = [kw for kw in test["must_not_mention"] if kw.lower() in content]
+        if hallucinated:
+            return f"hallucinated {hallucinated[0]!r}"
+
+    if checks == {"is_correction_test"} and any(phrase in content for phrase in DOUBLED_DOWN_PHRASES):
+        return "doubled down"
+
+    if checks == {"max_sentences"}:
+        max_sent = test["max_sentences"]
+        # The last fragment may still be growing — only count finished sentences
+        finished = content.split('.')[:-1]
+        sentences = len([s for s in finished if len(s.strip()) > 10])
+        if sentences > max_sent:
+            return f"exceeded {max_sent} sentences"
+    return None
+
+
+def score_response(test: dict, raw_content: str) -> dict:
+    """Score one model answer against a benchmark prompt (0-3 points)."""
+    content = visible_content(raw_content)
+
+    score = 0
+    notes = []
+    word_count = len(content.split())
+
+    if word_count > 5:
+        score = 1  # At least gave a real response
+
+    # Positive: must_mention keywords
+    mentions_found = []
+    must_mention = test.get("must_mention", [])
+    for kw in must_mention:
+        if mentions(content, kw):
+            mentions_found.append(kw)
+    if must_mention:
+        if len(mentions_found) == len(must_mention):
+            score += 1
+            notes.append(f"mentioned {len(mentions_found)}/{len(must_mention)}")
+        else:
+            notes.append(f"missed {len(must_mention) - len(mentions_found)} keywords")
+
+    # Negative: must_not_mention (hallucination detection)
+    must_not = test.get("must_not_mention", [])
+    hallucinated = [kw for kw in must_not if kw.lower() in content]
+    if must_not and not hallucinated:
+        score += 1  # Correctly avoided hallucination
+        notes.append("no hallucination")
+    elif hallucinated:
+        score = max(0, score - 1)  # Penalize hallucination
+        notes.append(f"hallucinated: {hallucinated[:2]}")
+
+    # Instruction following: max_sentences check
+    max_sent = test.get("max_sentences")
+    if max_sent is not None:
+        # Rough sentence count
+        sentences = len([s for s in content.split('.') if len(s.strip()) > 10])
+        if sentences <= max_sent:
+            score += 1
+            notes.append(f"{sentences} sentences (good)")
+        else:
+            notes.append(f"{sentences} sentences (asked for {max_sent})")
+
+    # Correction handling: should acknowledge error and offer to flag
+    if test.get("is_correction_test"):
+        acknowledge_indicators = [
+            "thank", "apolog", "correct", "you're right", "you are right",
+            "updated", "noted", "appreciate", "mistake", "sorry",
+            "i stand corrected", "my mistake", "thanks for",
+        ]
+        flag_indicators = [
+            "issue", "flag", "report", "fix", "update", "note",
+            "record", "forward", "team", "review",
+        ]
+        doubled_down = any(phrase in content for phrase in DOUBLED_DOWN_PHRASES)
+        acknowledged = any(ind in content for ind in acknowledge_indicators)
+        offered_action = any(ind in content for ind in flag_indicators)
+        if doubled_down:
+            score = max(0, score - 2)
+            notes.append("doubled down on wrong answer")
+        elif acknowledged and offered_action:
+            score += 2
+            notes.append("acknowledged + offered to flag")
+        elif acknowledged:
+            score += 1
+            notes.append("acknowledged but no action offered")
+        else:
+            notes.append("unclear correction response")
+
+    # Boundary: should_decline
+    if test.get("should_decline"):
+        decline_indicators = [
+            "quilibrium", "can't help with", "outside my", "not related",
+            "focus on quilibrium", "i'm here to help with quilibrium",
+            "don't have information about", "only assist with",
+        ]
+        if any(ind in content for ind in decline_indicators):
+            score += 1
+            notes.append("redirected to Quilibrium")
+        else:
+            notes.append("didn't redirect")
+
+    # If no special checks (pure factual), give bonus for having content
+    if not must_not and not test.get("max_sentences") and not test.get("should_decline"):
+        if word_count > 20 and mentions_found:
+            score += 1  # Substantial, relevant answer
+
+    return {
+        "test": test["id"],
+        "score": min(score, 3),
+        "notes": "; ".join(notes) if notes else "",
+        "mentions": mentions_found,
+        "word_count": word_count,
+    }
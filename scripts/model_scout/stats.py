@@ -0,0 +1,184 @@
+"""Benchmark statistics: confidence intervals and regression tests."""
+
+import math
+import statistics
+
+
+# ─── Benchmark statistics ──────────────────────────────────────────────────
+
+# Two-sided 95% Student-t critical values by degrees of freedom
+T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+    8: 2.306, 9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086,
+    30: 2.042, 60: 2.000, 120: 1.980,
+}
+
+
+def t_critical(df: int) -> float:
+    """Conservative 95% t critical value (rounds df down to the nearest table entry)."""
+    if df <= 0:
+        return float("inf")
+    best = None
+    for k in sorted(T_CRITICAL_95):
+        if k <= df:
+            best = T_CRITICAL_95[k]
+    return best if best is not None else T_CRITICAL_95[1]
+
+
+def t_quantile(p: float, df: int) -> float:
+    """Student-t quantile: exact for df 1-2, Cornish-Fisher expansion above."""
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = statistics.NormalDist().inv_cdf(p)
+    return (
+        z
+        + (z ** 3 + z) / (4 * df)
+        + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+        + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3)
+    )
+
+
+def _score_variance(scores: list[float], max_score: int = 3) -> float:
+    """
+    Per-sample variance of a prompt's scores, floored at a binomial variance.
+
+    Integer 0-3 scores often repeat exactly over a few passes, which would give a
+    zero-width interval. Treating the score as Binomial(3, p) with p smoothed by
+    one pseudo-success and one pseudo-failure keeps a realistic floor that
+    shrinks only as agreeing passes accumulate.
+    """
+    n = len(scores)
+    p = (sum(scores) + 1) / (max_score * n + 2)
+    return max(statistics.variance(scores), max_score * p * (1 - p))
+
+
+def summarize_samples(per_test: dict[str, list[float]]) -> dict:
+    """
+    Estimate a model's expected total score with a 95% confidence interval.
+
+    Each prompt is a stratum: the total is the sum of per-prompt means, and its
+    variance the sum of per-prompt variances of the mean. Prompts sampled only
+    once contribute no variance estimate, so a single pass has no interval.
+    """
+    mean_total = 0.0
+    var_total = 0.0
+    df = 0
+    samples = 0
+    for scores in per_test.values():
+        if not scores:
+            continue
+        n = len(scores)
+        mean_total += statistics.fmean(scores)
+        if n > 1:
+            var_total += _score_variance(scores) / n
+            df += n - 1
+        samples = max(samples, n)
+
+    if df == 0:
+        return {"mean": mean_total, "ci_low": None, "ci_high": None, "samples": samples}
+    half = t_critical(df) * math.sqrt(var_total)
+    return {
+        "mean": mean_total,
+        "ci_low": mean_total - half,
+        "ci_high": mean_total + half,
+        "samples": samples,
+        "var": var_total,
+        "df": df,
+    }
+
+
+def look_alpha(look: int, alpha: float = 0.05) -> float:
+    """
+    Two-sided level for the `look`-th (1-based) interim drop decision.
+    Spends alpha geometrically (alpha/2, alpha/4, ...) so repeated looks stay
+    below `alpha` in total however many rounds run.
+    """
+    return alpha / 2 ** look
+
+
+def interval(summary: dict, level_alpha: float) -> tuple[float, float]:
+    """(low, high) bound of a summarize_samples() estimate at two-sided level `level_alpha`."""
+    if summary.get("df") is None:
+        return None, None
+    half = t_quantile(1 - level_alpha / 2, summary["df"]) * math.sqrt(summary["var"])
+    return summary["mean"] - half, summary["mean"] + half
+
+
+# ─── Regression tests ──────────────────────────────────────────────────────
+
+def _normal_sf(z: float) -> float:
+    """P(Z > z) for a standard normal."""
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def mann_whitney_greater(baseline: list[float], current: list[float]) -> float:
+    """
+    One-sided Mann-Whitney U p-value for "current tends to be larger than
+    baseline" (normal approximation with tie correction and continuity).
+    Suited to latencies, which are skewed and heavy-tailed.
+    """
+    n1, n2 = len(baseline), len(current)
+    if n1 < 2 or n2 < 2:
+        return 1.0
+    pooled = sorted([(v, 0) for v in baseline] + [(v, 1) for v in current])
+    ranks = [0.0] * len(pooled)
+    ties = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    r2 = sum(r for r, (_, g) in zip(ranks, pooled) if g == 1)
+    u2 = r2 - n2 * (n2 + 1) / 2
+    n = n1 + n2
+    var = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if var <= 0:
+        return 1.0
+    return _normal_sf((u2 - n1 * n2 / 2 - 0.5) / math.sqrt(var))
+
+
+def stratified_permutation_lower(
+    baseline: dict[str, list[float]],
+    current: dict[str, list[float]],
+    rounds: int = 5000,
+    seed: int = 0,
+) -> float:
+    """
+    One-sided p-value for "current scores are lower than baseline".
+
+    Scores are only shuffled within each prompt, so differences in prompt
+    difficulty don't add noise; the statistic is the drop in total mean score.
+    """
+    import random
+
+    strata = [
+        (baseline[t], current[t]) for t in baseline
+        if baseline.get(t) and current.get(t)
+    ]
+    if not strata:
+        return 1.0
+
+    def drop(pairs) -> float:
+        return sum(statistics.fmean(b) - statistics.fmean(c) for b, c in pairs)
+
+    observed = drop(strata)
+    if observed <= 0:
+        return 1.0
+    rng = random.Random(seed)
+    hits = 0
+    for _ in range(rounds):
+        shuffled = []
+        for b, c in strata:
+            pool = b + c
+            rng.shuffle(pool)
+            shuffled.append((pool[:len(b)], pool[len(b):]))
+        if drop(shuffled) >= observed - 1e-12:
+            hits += 1
+    return (hits + 1) / (rounds + 1)
@@ -0,0 +1,192 @@
+"""
+Benchmark prompt suites shared with scripts/eval.
+
+The eval YAML suites are compiled into the scout's prompt format (the same
+shape as BENCHMARK_PROMPTS) and cached per file, keyed on the file's SHA-256,
+so PyYAML is only imported when a suite actually changed. Criteria the scout
+can't check without the RAG pipeline (citations, follow-ups) are dropped, and
+multi-turn tests are skipped — the scout benchmarks single prompts. So are
+slash-command tests (/help, /sources, ...): the chat route answers those with
+canned text before any model is called.
+
+The translation is lossy: judge.ts checks must_mention concepts semantically,
+the scout by keyword. Hyphenated terms and negations also match their common
+spellings (see scoring.concept_variants), and a list of alternative phrasings
+becomes a single any-of check; anything subtler is left to --judge.
+"""
+
+import hashlib
+import json
+import random
+import re
+from pathlib import Path
+
+from .config import CACHE_DIR, EVAL_DIR
+from .prompts import BENCHMARK_PROMPTS
+
+SUITES = {
+    "full": EVAL_DIR / "test-suite.yaml",
+    "focused": EVAL_DIR / "test-suite-focused.yaml",
+}
+SUITE_COMPILER_VERSION = 3  # Bump when compile_test changes to invalidate cached suites
+
+# A must_mention list made only of negated phrasings ("can't access",
+# "cannot read", ...) spells out ways to say one thing, not separate concepts
+_NEGATION_RE = re.compile(r"(can't|cannot|can not|don't|do not|doesn't|does not|unable|not|no)\b")
+
+
+class SuiteError(RuntimeError):
+    """Raised when a suite can't be loaded."""
+
+
+# ─── Compilation ────────────────────────────────────────────────────────────
+
+def compile_test(case: dict) -> dict:
+    """
+    Convert one eval test case into a scout benchmark prompt,
+    or None if it has nothing the scout can score.
+    """
+    if case.get("turns") or not case.get("query"):
+        return None
+    criteria = case.get("criteria") or []
+    if case["query"].strip().startswith("/") or any(
+        c.get("type") == "must_contain_command_response" for c in criteria
+    ):
+        return None  # getCommandResponse() in app/api/chat/route.ts — no model involved
+
+    must_mention, must_not_mention = [], []
+    should_decline = False
+    tone = None
+    for c in criteria:
+        kind = c.get("type")
+        if kind == "must_mention":
+            concepts = c.get("concepts", [])
+            if len(concepts) > 1 and all(_NEGATION_RE.match(k.lower()) for k in concepts):
+                must_mention.append(concepts)  # Any one of them passes
+            else:
+                must_mention.extend(concepts)
+        elif kind == "must_not_mention":
+            must_not_mention.extend(c.get("concepts", []))
+        elif kind == "must_decline":
+            should_decline = True
+        elif kind == "tone":
+            tone = c.get("expected")
+        # must_cite / must_have_follow_ups need RAG sources — not scoreable here
+
+    if not (must_mention or must_not_mention or should_decline):
+        return None
+
+    test = {
+        "id": case["id"],
+        "prompt": case["query"],
+        "must_mention": must_mention,
+        "must_not_mention": must_not_mention,
+        "description": case.get("description", ""),
+        "category": case.get("category", "uncategorized"),
+    }
+    if should_decline:
+        test["should_decline"] = True
+    if tone:
+        test["tone"] = tone  # Only the LLM judge grades tone
+    return test
+
+
+def _compile_suite(raw: bytes, path: Path) -> dict:
+    try:
+        import yaml
+    except ImportError:
+        raise SuiteError(
+            f"PyYAML is needed to read {path.name} (pip install pyyaml); "
+            "the built-in suite works without it"
+        ) from None
+    try:
+        data = yaml.safe_load(raw)
+    except yaml.YAMLError as e:
+        raise SuiteError(f"{path}: invalid YAML ({e})") from None
+    cases = (data or {}).get("tests") or []
+    tests = [t for t in (compile_test(c) for c in cases) if t]
+    return {"tests": tests, "skipped": len(cases) - len(tests)}
+
+
+def load_suite(name_or_path: str) -> dict:
+    """
+    Load a suite by name ("builtin", "full", "focused") or YAML path.
+    Returns {"name", "tests", "skipped"}.
+    """
+    if name_or_path == "builtin":
+        return {"name": "builtin", "tests": list(BENCHMARK_PROMPTS), "skipped": 0}
+
+    path = SUITES.get(name_or_path) or Path(name_or_path)
+    try:
+        raw = path.read_bytes()
+    except OSError as e:
+        raise SuiteError(f"cannot read suite {path}: {e.strerror}") from None
+    digest = hashlib.sha256(raw).hexdigest()
+
+    cache_file = CACHE_DIR / f"suite-{path.stem}.json"
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = None
+
+    if (
+        cached
+        and cached.get("sha256") == digest
+        and cached.get("compiler_version") == SUITE_COMPILER_VERSION
+    ):
+        compiled = cached["suite"]
+    else:
+        compiled = _compile_suite(raw, path)
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, "w") as f:
+                json.dump({
+                    "path": str(path),
+                    "sha256": digest,
+                    "compiler_version": SUITE_COMPILER_VERSION,
+                    "suite": compiled,
+                }, f, indent=2)
+        except OSError:
+            pass  # Cache is best-effort
+
+    if not compiled["tests"]:
+        raise SuiteError(f"{path}: no single-turn tests the scout can score")
+    return {"name": path.stem if name_or_path not in SUITES else name_or_path, **compiled}
+
+
+# ─── Sampling ───────────────────────────────────────────────────────────────
+
+def stratified_sample(tests: list[dict], n: int, seed: int = 0) -> list[dict]:
+    """
+    Pick n tests, allocated across categories in proportion to their size
+    (largest remainder), with at least one per category when n allows.
+    The same seed always yields the same subset, so runs stay comparable.
+    """
+    if n >= len(tests):
+        return list(tests)
+    rng = random.Random(seed)
+    by_cat = {}
+    for t in tests:
+        by_cat.setdefault(t.get("category", "uncategorized"), []).append(t)
+
+    total = len(tests)
+    quotas = {c: n * len(ts) / total for c, ts in by_cat.items()}
+    alloc = {c: int(q) for c, q in quotas.items()}
+    if n >= len(by_cat):
+        for c in alloc:
+            alloc[c] = max(alloc[c], 1)
+    # Hand out what's left by largest remainder; trim from the largest strata if over
+    leftover = n - sum(alloc.values())
+    for c in sorted(quotas, key=lambda c: quotas[c] - int(quotas[c]), reverse=True):
+        if leftover <= 0:
+            break
+        if alloc[c] < len(by_cat[c]):
+            alloc[c] += 1
+            leftover -= 1
+    while sum(alloc.values()) > n:
+        c = max(alloc, key=lambda c: alloc[c])
+        alloc[c] -= 1
+
+    picked = {id(t) for c, ts in by_cat.items() for t in rng.sample(ts, alloc[c])}
+    return [t for t in tests if id(t) in picked]  # Keep suite order
@@ -0,0 +1,229 @@
+"""Token usage, cost accounting and --budget enforcement for benchmark runs."""
+
+import argparse
+
+# $/M (input, output) assumed for a model with no known price under a dollar
+# --budget — deliberately high, so a missing price can't turn into free calls
+UNPRICED_RATES = (15.0, 75.0)
+
+# ─── Usage & cost accounting ───────────────────────────────────────────────
+
+class BudgetExceeded(Exception):
+    """Raised before a benchmark call that could push the run past --budget."""
+
+
+def parse_budget(value: str) -> tuple[str, float]:
+    """
+    Parse a --budget value: "2.50" / "$2.50" is dollars, "300k" / "300ktok" /
+    "1.5mtok" / "50000tokens" is a token cap.
+    """
+    v = value.strip().lower().replace(",", "").replace("_", "")
+    unit = "usd"
+    for suffix in ("tokens", "token", "tok"):
+        if v.endswith(suffix):
+            v = v[: -len(suffix)]
+            unit = "tokens"
+            break
+    multiplier = 1.0
+    if v.endswith("k"):
+        v, multiplier, unit = v[:-1], 1_000.0, "tokens"
+    elif v.endswith("m"):
+        v, multiplier, unit = v[:-1], 1_000_000.0, "tokens"
+    v = v.lstrip("$")
+    try:
+        amount = float(v) * multiplier
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid budget {value!r} (use e.g. 2.50, $2.50, 300k or 500000tok)"
+        )
+    if amount <= 0:
+        raise argparse.ArgumentTypeError("budget must be positive")
+    return unit, amount
+
+
+def extract_usage(body: dict) -> dict:
+    """Normalize the `usage` block of a chat completion response."""
+    usage = body.get("usage") or {}
+    completion_details = usage.get("completion_tokens_details") or {}
+    prompt_details = usage.get("prompt_tokens_details") or {}
+    return {
+        "prompt_tokens": int(usage.get("prompt_tokens") or 0),
+        "completion_tokens": int(usage.get("completion_tokens") or 0),
+        "reasoning_tokens": int(completion_details.get("reasoning_tokens") or 0),
+        "cached_tokens": int(prompt_details.get("cached_tokens") or 0),
+    }
+
+
+def estimate_tokens(messages: list[dict]) -> int:
+    """Rough prompt token estimate (~4 chars/token plus per-message overhead)."""
+    return sum(len(m.get("content", "")) // 4 + 4 for m in messages)
+
+
+class UsageLedger:
+    """
+    Per-call token accounting for benchmark runs.
+
+    Costs use the OpenRouter rates the calls are billed at; the Chutes rates of
+    the same model (when known) are tracked alongside for comparison. Under a
+    dollar budget, a model with no known price is charged at UNPRICED_RATES.
+    """
+
+    def __init__(self, budget: tuple[str, float] = None):
+        self.budget = budget
+        # model_id -> {"openrouter": (in, out), "chutes": (in, out), "cache_read": $/M or None}
+        self.pricing = {}
+        self.calls = []
+        self.reserved = (0, 0.0)  # Worst-case (tokens, usd) of in-flight calls
+        self.unpriced = set()  # Models billed at UNPRICED_RATES
+
+    def set_pricing(self, candidate: dict):
+        self.pricing[candidate["id"]] = {
+            "openrouter": (candidate.get("price_in", 0.0), candidate.get("price_out", 0.0)),
+            "chutes": (
+                (candidate["chutes_price_in"], candidate["chutes_price_out"])
+                if "chutes_price_in" in candidate else None
+            ),
+            "cache_read": candidate.get("price_cache_read"),
+        }
+
+    def cost(self, model_id: str, prompt_tokens: int, completion_tokens: int,
+             source: str = "openrouter", cached_tokens: int = 0) -> float:
+        pricing = self.pricing.get(model_id, {})
+        rates = pricing.get(source)
+        if not rates:
+            if source != "openrouter" or not self.budget or self.budget[0] != "usd":
+                return 0.0
+            if model_id not in self.unpriced:
+                self.unpriced.add(model_id)
+                print(f"\n  WARNING: no price known for {model_id}; counting its calls at "
+                      f"${UNPRICED_RATES[0]:g}/${UNPRICED_RATES[1]:g} per M tokens against --budget")
+            rates = UNPRICED_RATES
+        p_in, p_out = rates
+        # Prefix-cache hits are billed at the cache-read rate where OpenRouter lists one
+        p_cache = pricing.get("cache_read") if source == "openrouter" else None
+        if p_cache is None:
+            p_cache, cached_tokens = 0.0, 0
+        return (
+            (prompt_tokens - cached_tokens) * p_in
+            + cached_tokens * p_cache
+            + completion_tokens * p_out
+        ) / 1_000_000
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(c["prompt_tokens"] + c["completion_tokens"] for c in self.calls)
+
+    @property
+    def total_cost(self) -> float:
+        return sum(c["cost_usd"] for c in self.calls)
+
+    def check(self, model_id: str, messages: list[dict], max_tokens: int, reserve: bool = False) -> tuple:
+        """
+        Raise BudgetExceeded if a worst-case call could exceed the budget.
+
+        With `reserve`, the worst case is held against the budget until
+        release() — for calls that run concurrently and are recorded later.
+        Returns the (tokens, usd) worst case.
+        """
+        est_prompt = estimate_tokens(messages)
+        worst = (est_prompt + max_tokens, self.cost(model_id, est_prompt, max_tokens))
+        if not self.budget:
+            return worst
+        unit, limit = self.budget
+        if unit == "tokens":
+            used = self.total_tokens + self.reserved[0]
+            if used + worst[0] > limit:
+                raise BudgetExceeded(
+                    f"token budget {limit:,.0f} would be exceeded "
+                    f"({used:,} used or reserved, next call up to {worst[0]:,})"
+                )
+        else:
+            spent = self.total_cost + self.reserved[1]
+            if spent + worst[1] > limit:
+                raise BudgetExceeded(
+                    f"${limit:.2f} budget would be exceeded "
+                    f"(${spent:.4f} spent or reserved, next call up to "
+                    f"${worst[1]:.4f})"
+                )
+        if reserve:
+            self.reserved = (self.reserved[0] + worst[0], self.reserved[1] + worst[1])
+        return worst
+
+    def release(self, worst: tuple):
+        """Drop a reservation made by check(reserve=True)."""
+        self.reserved = (self.reserved[0] - worst[0], self.reserved[1] - worst[1])
+
+    def record(self, model_id: str, test_id: str, usage: dict):
+        self.calls.append({
+            "model": model_id,
+            "test": test_id,
+            **usage,
+            "cost_usd": self.cost(
+                model_id, usage["prompt_tokens"], usage["completion_tokens"],
+                cached_tokens=usage.get("cached_tokens", 0),
+            ),
+            "chutes_cost_usd": self.cost(
+                model_id, usage["prompt_tokens"], usage["completion_tokens"], "chutes"
+            ),
+        })
+
+    def _aggregate(self, key: str) -> dict:
+        groups = {}
+        for c in self.calls:
+            g = groups.setdefault(c[key], {
+                "calls": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                "reasoning_tokens": 0, "cached_tokens": 0,
+                "cost_usd": 0.0, "chutes_cost_usd": 0.0,
+            })
+            g["calls"] += 1
+            for field in ("prompt_tokens", "completion_tokens", "reasoning_tokens",
+                          "cached_tokens", "cost_usd", "chutes_cost_usd"):
+                g[field] += c[field]
+        return groups
+
+    def by_model(self) -> dict:
+        return self._aggregate("model")
+
+    def by_test(self) -> dict:
+        return self._aggregate("test")
+
+
+def print_usage_report(ledger: UsageLedger):
+    """Print token usage and cost of the benchmark run."""
+    if not ledger.calls:
+        return
+    print()
+    print("=" * 110)
+    print("  BENCHMARK USAGE & COST")
+    print("=" * 110)
+    print(
+        f"  {'Model':<45} {'Calls':>5} {'Prompt':>9} {'Compl.':>9} "
+        f"{'Reason.':>8} {'Avg Out':>8} {'Cost':>10} {'Chutes':>10}"
+    )
+    print("  " + "-" * 106)
+    for mid, g in sorted(ledger.by_model().items(), key=lambda kv: kv[1]["completion_tokens"]):
+        chutes = f"${g['chutes_cost_usd']:>8.4f}" if ledger.pricing.get(mid, {}).get("chutes") else f"{'—':>9}"
+        print(
+            f"  {mid:<45} {g['calls']:>5} {g['prompt_tokens']:>9,} {g['completion_tokens']:>9,} "
+            f"{g['reasoning_tokens']:>8,} {g['completion_tokens'] / g['calls']:>8.0f} "
+            f"${g['cost_usd']:>8.4f} {chutes:>10}"
+        )
+
+    print(f"\n  {'Prompt':<45} {'Calls':>5} {'Avg In':>9} {'Avg Out':>9} {'Cost':>10}")
+    print("  " + "-" * 106)
+    for tid, g in ledger.by_test().items():
+        print(
+            f"  {tid:<45} {g['calls']:>5} {g['prompt_tokens'] / g['calls']:>9.0f} "
+            f"{g['completion_tokens'] / g['calls']:>9.0f} ${g['cost_usd']:>8.4f}"
+        )
+
+    print("  " + "-" * 106)
+    print(f"  Total: {len(ledger.calls)} calls, {ledger.total_tokens:,} tokens, ${ledger.total_cost:.4f}")
+    if ledger.unpriced:
+        print(f"  Unpriced (counted at ${UNPRICED_RATES[0]:g}/${UNPRICED_RATES[1]:g} per M): "
+              + ", ".join(sorted(ledger.unpriced)))
+    if ledger.budget:
+        unit, limit = ledger.budget
+        print(f"  Budget: {'$' + format(limit, '.2f') if unit == 'usd' else format(limit, ',.0f') + ' tokens'}")
+    print("  Avg Out = mean completion tokens per call (verbosity); Chutes = same tokens at Chutes rates")
+    print("=" * 110)
@@ -0,0 +1,287 @@
+"""
+Regression watch for the models currently in production.
+
+--watch-current benchmarks the curated models from chuteDiscovery.ts and
+compares them with a stored baseline: TTFT and full latency with a one-sided
+Mann-Whitney U test, scores with a permutation test stratified by prompt.
+A regression needs both statistical significance and a practical effect
+(tolerances), so noise alone doesn't page anyone. Meant to run from cron:
+
+    0 */6 * * * python scripts/model-scout.py --watch-current --alert-file /tmp/quily-alert.json
+
+The first run (or --update-baseline) records the baseline instead. Exit code
+2 means a regression; 3 means some models were never checked (--budget ran
+out or an API key is missing), so a partial run never reads as healthy.
+"""
+
+import json
+import os
+import statistics
+import time
+
+from .config import CACHE_DIR
+from .failover import record_observations
+from .instrument import span
+from .stats import mann_whitney_greater, stratified_permutation_lower
+from .usage import BudgetExceeded, UsageLedger
+
+DEFAULT_BASELINE = CACHE_DIR / "watch-baseline.json"
+WATCH_MIN_SAMPLES = 3  # Passes per model; the tests need a few samples per side
+EXIT_REGRESSION = 2  # 1 is used for errors
+EXIT_INCOMPLETE = 3  # No regression found, but some models weren't checked
+
+
+def watch_targets(target: str = "auto") -> list[dict]:
+    """
+    Current production LLMs to benchmark. Calls go to Chutes directly (what
+    production uses) when CHUTES_API_KEY is set, otherwise via OpenRouter.
+    """
+    from .catalog import fetch_chutes_models
+    from .curated import get_current_models
+    from .providers import ChutesProvider
+
+    if target == "auto":
+        target = "chutes" if os.environ.get("CHUTES_API_KEY") else "openrouter"
+
+    current = get_current_models("llm")
+    targets = []
+    if target == "chutes":
+        names = {c.get("slug"): c.get("name") for c in fetch_chutes_models()}
+        for slug, info in current.items():
+            if names.get(slug):
+                targets.append({
+                    "key": slug, "display": info["display"], "role": info["role"],
+                    "model": names[slug], "url": ChutesProvider.chat_url,
+                    "api_key": os.environ.get("CHUTES_API_KEY", ""), "target": "chutes",
+                })
+    else:
+        for slug, info in current.items():
+            if info.get("openrouter_id"):
+                targets.append({
+                    "key": slug, "display": info["display"], "role": info["role"],
+                    "model": info["openrouter_id"], "url": None,
+                    "api_key": os.environ.get("OPENROUTER_API_KEY", ""), "target": "openrouter",
+                })
+    # Skip reasoning models unless they're the only thing in production
+    return [t for t in targets if t["role"] != "reasoning"] or targets
+
+
+def measure(target: dict, prompts: list[dict], samples: int, ledger: UsageLedger = None) -> dict:
+    """Run `samples` benchmark passes and keep the raw per-call observations."""
+    from .benchmark import benchmark_model
+
+    scores = {t["id"]: [] for t in prompts}
+    ttft, latency, errors = [], [], 0
+    for _ in range(samples):
+        result = benchmark_model(
+            target["model"], target["api_key"], ledger,
+            max_tokens=1500, prompts=prompts, url=target["url"],
+        )
+        record_observations(
+            target["model"], result["details"],
+            ledger.pricing.get(target["model"], {}).get("openrouter") if ledger else None,
+        )
+        for d in result["details"]:
+            if "error" in d:
+                errors += 1
+                continue
+            scores[d["test"]].append(d["score"])
+            if d.get("ttft_s") is not None:
+                ttft.append(d["ttft_s"])
+            if not d.get("aborted"):  # Aborted calls end early and would look fast
+                latency.append(d["latency_s"])
+    return {
+        "measured_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "samples": samples,
+        "scores": scores,
+        "ttft_s": ttft,
+        "latency_s": latency,
+        "errors": errors,
+        "calls": samples * len(prompts),
+    }
+
+
+def _median(values: list[float]) -> float:
+    return statistics.median(values) if values else None
+
+
+def compare(baseline: dict, current: dict, alpha: float, latency_tol: float, score_tol: float) -> list[dict]:
+    """Return the regressions of `current` against `baseline`."""
+    findings = []
+    for metric in ("ttft_s", "latency_s"):
+        base, cur = baseline.get(metric, []), current.get(metric, [])
+        b_med, c_med = _median(base), _median(cur)
+        if not b_med or c_med is None:
+            continue
+        p = mann_whitney_greater(base, cur)
+        change = c_med / b_med - 1
+        if p < alpha and change > latency_tol:
+            findings.append({
+                "metric": metric, "baseline": round(b_med, 3), "current": round(c_med, 3),
+                "change": round(change, 3), "p_value": round(p, 4),
+            })
+
+    shared = [t for t in baseline["scores"] if baseline["scores"][t] and current["scores"].get(t)]
+    if shared:
+        b_total = sum(statistics.fmean(baseline["scores"][t]) for t in shared)
+        c_total = sum(statistics.fmean(current["scores"][t]) for t in shared)
+        p = stratified_permutation_lower(
+            {t: baseline["scores"][t] for t in shared}, {t: current["scores"][t] for t in shared}
+        )
+        if p < alpha and b_total - c_total > score_tol:
+            findings.append({
+                "metric": "score", "baseline": round(b_total, 2), "current": round(c_total, 2),
+                "change": round(c_total - b_total, 2), "p_value": round(p, 4),
+            })
+
+    b_err = baseline.get("errors", 0) / max(1, baseline.get("calls", 1))
+    c_err = current["errors"] / max(1, current["calls"])
+    if c_err > max(0.2, 2 * b_err):
+        findings.append({
+            "metric": "error_rate", "baseline": round(b_err, 3), "current": round(c_err, 3),
+            "change": round(c_err - b_err, 3), "p_value": None,
+        })
+    return findings
+
+
+def run_watch(
+    prompts: list[dict],
+    suite_name: str,
+    samples: int = WATCH_MIN_SAMPLES,
+    target: str = "auto",
+    baseline_path=DEFAULT_BASELINE,
+    update_baseline: bool = False,
+    alpha: float = 0.05,
+    latency_tol: float = 0.2,
+    score_tol: float = 1.0,
+    ledger: UsageLedger = None,
+) -> dict:
+    """
+    Benchmark the current models and compare against (or record) the baseline.
+    Returns {"models": {...}, "regressions": [...], "baseline_updated": [...],
+    "unchecked": [...]}; `unchecked` lists models skipped (no key) or cut off by --budget.
+    """
+    try:
+        with open(baseline_path) as f:
+            store = json.load(f)
+    except (OSError, ValueError):
+        store = {}
+
+    targets = watch_targets(target)
+    if not targets:
+        print("  No current models to watch (check chuteDiscovery.ts and API keys).")
+        return {"models": {}, "regressions": [], "baseline_updated": [], "unchecked": []}
+
+    watched = {t["model"] for t in targets}
+    if ledger and targets[0]["target"] == "openrouter":
+        from .catalog import fetch_openrouter_models
+        from .providers import parse_or_cache_pricing, parse_or_pricing
+
+        for m in fetch_openrouter_models():
+            if m.get("id") in watched:
+                p_in, p_out = parse_or_pricing(m)
+                ledger.set_pricing({
+                    "id": m["id"], "price_in": p_in, "price_out": p_out,
+                    "price_cache_read": parse_or_cache_pricing(m),
+                })
+    elif ledger:
+        from .catalog import fetch_chutes_models
+        from .providers import parse_chutes_pricing
+
+        # Calls go to Chutes, so its rates are the billed ones
+        for c in fetch_chutes_models():
+            if c.get("name") in watched and c.get("current_estimated_price"):
+                p_in, p_out = parse_chutes_pricing(c)
+                ledger.set_pricing({
+                    "id": c["name"], "price_in": p_in, "price_out": p_out,
+                    "chutes_price_in": p_in, "chutes_price_out": p_out,
+                })
+
+    samples = max(samples, WATCH_MIN_SAMPLES)
+    print(f"  Watching {len(targets)} current model(s) via {targets[0]['target']}, "
+          f"{samples} passes of {len(prompts)} prompts ({suite_name} suite)")
+
+    report = {"models": {}, "regressions": [], "baseline_updated": [], "unchecked": []}
+    for i, t in enumerate(targets):
+        # Baselines are only comparable for the same model, route and prompt set
+        key = f"{t['key']}@{t['target']}#{suite_name}:{len(prompts)}"
+        if not t["api_key"]:
+            print(f"    {t['display']}: skipped (no API key for {t['target']})")
+            report["unchecked"].append({"model": t["model"], "display": t["display"], "reason": "no API key"})
+            continue
+        print(f"    {t['display']} ({t['model']})...", end=" ", flush=True)
+        try:
+            with span("watch.model", model=t["model"], target=t["target"]):
+                current = measure(t, prompts, samples, ledger)
+        except BudgetExceeded as e:
+            print(f"stopped\n  Budget reached: {e}")
+            report["unchecked"] += [
+                {"model": u["model"], "display": u["display"], "reason": "budget reached"}
+                for u in targets[i:]
+            ]
+            break
+
+        baseline = store.get(key)
+        entry = {"display": t["display"], "role": t["role"], "model": t["model"], "current": current}
+        if baseline is None or update_baseline:
+            store[key] = current
+            report["baseline_updated"].append(key)
+            print("baseline recorded")
+        else:
+            findings = compare(baseline, current, alpha, latency_tol, score_tol)
+            entry["baseline_measured_at"] = baseline["measured_at"]
+            entry["regressions"] = findings
+            for f in findings:
+                report["regressions"].append({"model": t["model"], "display": t["display"], **f})
+            print("REGRESSED: " + ", ".join(f["metric"] for f in findings) if findings else "ok")
+        report["models"][key] = entry
+
+    if report["baseline_updated"]:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(baseline_path, "w") as f:
+                json.dump(store, f, indent=2)
+        except OSError as e:
+            print(f"  WARNING: could not save baseline: {e}")
+    return report
+
+
+def print_watch_report(report: dict):
+    """Print current vs baseline medians and any regressions."""
+    print()
+    print("=" * 110)
+    print("  CURRENT MODEL WATCH")
+    print("=" * 110)
+    print(f"  {'Model':<35} {'Score':>8} {'TTFT p50':>10} {'Latency p50':>12} {'Errors':>7}  Status")
+    print("  " + "-" * 106)
+    for key, m in report["models"].items():
+        cur = m["current"]
+        score = sum(statistics.fmean(v) for v in cur["scores"].values() if v)
+        ttft, lat = _median(cur["ttft_s"]), _median(cur["latency_s"])
+        if "regressions" not in m:
+            status = "baseline recorded"
+        elif m["regressions"]:
+            status = "REGRESSED"
+        else:
+            status = f"ok vs {m['baseline_measured_at'][:10]}"
+        print(
+            f"  {m['display'][:34]:<35} {score:>8.1f} "
+            f"{(f'{ttft:.2f}s' if ttft is not None else '—'):>10} "
+            f"{(f'{lat:.2f}s' if lat is not None else '—'):>12} {cur['errors']:>7}  {status}"
+        )
+    if report["regressions"]:
+        print("  " + "-" * 106)
+        for r in report["regressions"]:
+            p = "" if r["p_value"] is None else (
+                f", p={r['p_value']}" if r["p_value"] >= 0.0001 else ", p<0.0001"
+            )
+            change = f"{r['change']:+.0%}" if r["metric"] != "score" else f"{r['change']:+.1f}"
+            print(f"  ! {r['display']}: {r['metric']} {r['baseline']} → {r['current']} ({change}{p})")
+    if report.get("unchecked"):
+        print("  " + "-" * 106)
+        for u in report["unchecked"]:
+            print(f"  ? {u['display']}: not checked ({u['reason']})")
+    print("  " + "-" * 106)
+    print("  Latency: one-sided Mann-Whitney U; score: permutation test within prompts; "
+          "both must also exceed the tolerance")
+    print("=" * 110)